@@ -5,8 +5,16 @@ APP評論爬取工具
 """
 
 import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+except ImportError:  # 未安裝 pyarrow 時退回 pandas.to_csv
+    pa = None
+    pacsv = None
+
 # 從我們建立的模組中導入函式
 from google_play_scraper_module import scrape_google_play_reviews
 from app_store_scraper_module import scrape_app_store_reviews
@@ -21,6 +29,43 @@ def generate_structured_filename(platform, app_id, timestamp=None):
     return f"{platform}_reviews_{clean_app_id}_{timestamp}.csv"
 
 
+def write_csv_utf8_sig(df, file_path):
+    """
+    以 UTF-8 BOM 編碼寫出CSV（優先使用 pyarrow，未安裝時退回 pandas）
+
+    Args:
+        df (pd.DataFrame): 要寫出的DataFrame
+        file_path (str): 文件路徑
+    """
+    table = None
+    if pacsv is not None:
+        try:
+            table = pa.Table.from_pandas(df, preserve_index=False)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            table = None  # 混合型別欄位無法轉為 Arrow，改用 pandas 寫出
+
+    if table is None:
+        df.to_csv(file_path, index=False, encoding="utf-8-sig")
+        return
+
+    with open(file_path, "wb") as f:
+        f.write(b"\xef\xbb\xbf")
+        pacsv.write_csv(table, f)
+
+
+def save_platform_reviews(df, platform, display_name, app_id, output_dir, timestamp):
+    """
+    保存單一平台的評論CSV
+    """
+    if not df.empty:
+        filename = generate_structured_filename(platform, app_id, timestamp)
+        filepath = os.path.join(output_dir, filename)
+        write_csv_utf8_sig(df, filepath)
+        print(f"✓ {display_name} 評論已儲存: {filepath}\n")
+    else:
+        print(f"✗ {display_name} 評論抓取失敗\n")
+
+
 def main():
     """主程式"""
 
@@ -44,35 +89,32 @@ def main():
     print(f"目標評論數量: {REVIEW_COUNT}")
     print(f"輸出目錄: {output_dir}\n")
 
-    # 抓取 Google Play 評論 (調用模組)
-    google_df = scrape_google_play_reviews(
-        app_id=GOOGLE_APP_ID,
-        country=COUNTRY,
-        count=REVIEW_COUNT
-    )
-
-    if not google_df.empty:
-        google_filename = generate_structured_filename("google_play", GOOGLE_APP_ID, timestamp)
-        google_filepath = os.path.join(output_dir, google_filename)
-        google_df.to_csv(google_filepath, index=False, encoding="utf-8-sig")
-        print(f"✓ Google Play 評論已儲存: {google_filepath}\n")
-    else:
-        print("✗ Google Play 評論抓取失敗\n")
-
-    # 抓取 App Store 評論 (調用模組)
-    apple_df = scrape_app_store_reviews(
-        app_id=APPLE_APP_ID,
-        country=COUNTRY,
-        count=REVIEW_COUNT
-    )
-
-    if not apple_df.empty:
-        apple_filename = generate_structured_filename("app_store", APPLE_APP_ID, timestamp)
-        apple_filepath = os.path.join(output_dir, apple_filename)
-        apple_df.to_csv(apple_filepath, index=False, encoding="utf-8-sig")
-        print(f"✓ App Store 評論已儲存: {apple_filepath}\n")
-    else:
-        print("✗ App Store 評論抓取失敗\n")
+    # 同時抓取兩個平台的評論 (調用模組)；兩者互不相依，哪個先完成就先儲存
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        futures = {
+            executor.submit(
+                scrape_google_play_reviews,
+                app_id=GOOGLE_APP_ID,
+                country=COUNTRY,
+                count=REVIEW_COUNT
+            ): ("google_play", "Google Play", GOOGLE_APP_ID),
+            executor.submit(
+                scrape_app_store_reviews,
+                app_id=APPLE_APP_ID,
+                country=COUNTRY,
+                count=REVIEW_COUNT
+            ): ("app_store", "App Store", APPLE_APP_ID),
+        }
+
+        results = {}
+        for future in as_completed(futures):
+            platform, display_name, app_id = futures[future]
+            df = future.result()
+            results[platform] = df
+            save_platform_reviews(df, platform, display_name, app_id, output_dir, timestamp)
+
+    google_df = results["google_play"]
+    apple_df = results["app_store"]
 
     print("=" * 60)
     print("爬取完成總結:")
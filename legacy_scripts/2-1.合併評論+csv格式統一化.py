@@ -20,7 +20,110 @@ import os
 import sys
 import pandas as pd
 from datetime import datetime
-import glob
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+except ImportError:  # 未安裝 pyarrow 時退回 pandas.to_csv
+    pa = None
+    pacsv = None
+
+# 讀取CSV時只解析需要的欄位並指定型別
+GOOGLE_PLAY_DTYPES = {
+    'reviewId': 'string',
+    'userName': 'string',
+    'score': 'Int16',
+    'at': 'string',
+    'content': 'string',
+}
+APP_STORE_DTYPES = {
+    'reviewId': 'string',
+    'userName': 'string',
+    'rating': 'Int16',
+    'date': 'string',
+    'title': 'string',
+    'review': 'string',
+}
+
+
+def _read_review_csv(csv_path, dtype_map):
+    """
+    只讀取 dtype_map 中列出且實際存在的欄位（有 pyarrow 時使用 Arrow 解析引擎）
+
+    Args:
+        csv_path (str): CSV文件路徑
+        dtype_map (dict): 欄位名稱與型別的對照
+
+    Returns:
+        pd.DataFrame: 只包含所需欄位的DataFrame
+    """
+    header = pd.read_csv(csv_path, encoding='utf-8-sig', nrows=0).columns
+    usecols = [col for col in dtype_map if col in header]
+    return pd.read_csv(
+        csv_path,
+        encoding='utf-8-sig',
+        usecols=usecols,
+        dtype={col: dtype_map[col] for col in usecols},
+        engine='pyarrow' if pa is not None else 'c',
+    )
+
+
+def _get_column(df, column):
+    """
+    取得指定欄位；若欄位不存在則回傳等長的空字串欄位
+
+    Args:
+        df (pd.DataFrame): 來源DataFrame
+        column (str): 欄位名稱
+
+    Returns:
+        pd.Series: 欄位數據
+    """
+    if column in df.columns:
+        return df[column]
+    return pd.Series('', index=df.index, dtype='string')
+
+
+def _to_text(series):
+    """
+    轉為 pandas 'string' 型別並以空字串填補缺失值（整欄一次完成，不逐筆 str()）
+
+    Args:
+        series (pd.Series): 原始文字欄位
+
+    Returns:
+        pd.Series: 'string' 型別欄位
+    """
+    return series.astype('string').fillna('')
+
+
+def _to_rating(series):
+    """
+    將評分欄位轉為整數，無法解析的值以0代替
+
+    Args:
+        series (pd.Series): 原始評分欄位
+
+    Returns:
+        pd.Series: 整數評分
+    """
+    return pd.to_numeric(series, errors='coerce').fillna(0).astype('int16')
+
+
+def _to_datetime(series):
+    """
+    以明確的 ISO 8601 格式解析時間欄位，避免逐筆推測格式
+
+    帶時區偏移的時間（如 App Store 的 -07:00）一律換算為 UTC，
+    無時區的時間視為 UTC，最後去除時區資訊，兩個平台的欄位型別一致、可直接排序。
+
+    Args:
+        series (pd.Series): 原始時間欄位
+
+    Returns:
+        pd.Series: 無時區的 datetime64 欄位，無法解析的值為NaT
+    """
+    return pd.to_datetime(series, format='ISO8601', errors='coerce', utc=True).dt.tz_localize(None)
 
 
 def load_google_play_reviews(csv_path):
@@ -34,7 +137,7 @@ def load_google_play_reviews(csv_path):
         pd.DataFrame: 統一格式的DataFrame
     """
     try:
-        df = pd.read_csv(csv_path, encoding='utf-8-sig')
+        df = _read_review_csv(csv_path, GOOGLE_PLAY_DTYPES)
 
         # 檢查必要的字段
         required_columns = ['reviewId', 'userName', 'score', 'at', 'content']
@@ -42,20 +145,15 @@ def load_google_play_reviews(csv_path):
         if missing_columns:
             print(f"警告：Google Play CSV缺少字段：{missing_columns}")
 
-        # 創建統一格式
-        unified_data = []
-        for _, row in df.iterrows():
-            unified_row = {
-                'platform': 'google_play',
-                'reviewId': str(row.get('reviewId', '')),
-                'userName': str(row.get('userName', '')),
-                'rating': int(row.get('score', 0)) if pd.notna(row.get('score')) else 0,
-                'date': str(row.get('at', '')),
-                'content': str(row.get('content', ''))
-            }
-            unified_data.append(unified_row)
-
-        return pd.DataFrame(unified_data)
+        # 創建統一格式（整欄向量化運算，不逐行建立字典）
+        return pd.DataFrame({
+            'platform': 'google_play',
+            'reviewId': _to_text(_get_column(df, 'reviewId')),
+            'userName': _to_text(_get_column(df, 'userName')),
+            'rating': _to_rating(_get_column(df, 'score')),
+            'date': _to_datetime(_get_column(df, 'at')),
+            'content': _to_text(_get_column(df, 'content')),
+        })
 
     except Exception as e:
         print(f"讀取Google Play CSV失敗：{e}")
@@ -73,7 +171,7 @@ def load_app_store_reviews(csv_path):
         pd.DataFrame: 統一格式的DataFrame
     """
     try:
-        df = pd.read_csv(csv_path, encoding='utf-8-sig')
+        df = _read_review_csv(csv_path, APP_STORE_DTYPES)
 
         # 檢查必要的字段
         required_columns = ['reviewId', 'userName', 'rating', 'date', 'review']
@@ -81,31 +179,55 @@ def load_app_store_reviews(csv_path):
         if missing_columns:
             print(f"警告：App Store CSV缺少字段：{missing_columns}")
 
-        # 創建統一格式
-        unified_data = []
-        for _, row in df.iterrows():
-            # 合併標題和內容
-            title = str(row.get('title', ''))
-            review_content = str(row.get('review', ''))
-            content = f"{title}\n{review_content}".strip() if title else review_content
-
-            unified_row = {
-                'platform': 'app_store',
-                'reviewId': str(row.get('reviewId', '')),
-                'userName': str(row.get('userName', '')),
-                'rating': int(row.get('rating', 0)) if pd.notna(row.get('rating')) else 0,
-                'date': str(row.get('date', '')),
-                'content': content
-            }
-            unified_data.append(unified_row)
-
-        return pd.DataFrame(unified_data)
+        # 合併標題和內容（整欄字串拼接）
+        title = _to_text(_get_column(df, 'title'))
+        review_content = _to_text(_get_column(df, 'review'))
+        content = title.str.cat(review_content, sep='\n').str.strip()
+
+        # 創建統一格式（整欄向量化運算，不逐行建立字典）
+        return pd.DataFrame({
+            'platform': 'app_store',
+            'reviewId': _to_text(_get_column(df, 'reviewId')),
+            'userName': _to_text(_get_column(df, 'userName')),
+            'rating': _to_rating(_get_column(df, 'rating')),
+            'date': _to_datetime(_get_column(df, 'date')),
+            'content': content,
+        })
 
     except Exception as e:
         print(f"讀取App Store CSV失敗：{e}")
         return pd.DataFrame()
 
 
+def _latest_csv_files(output_dir, keywords):
+    """
+    單次掃描目錄，找出檔名包含各關鍵字的最新CSV文件
+
+    Args:
+        output_dir (str): 目錄路徑
+        keywords (tuple): 檔名關鍵字
+
+    Returns:
+        list: 與 keywords 對應的文件路徑，找不到則為None
+    """
+    best_paths = [None] * len(keywords)
+    best_mtimes = [-1.0] * len(keywords)
+    if not os.path.isdir(output_dir):
+        return best_paths
+
+    with os.scandir(output_dir) as entries:
+        for entry in entries:
+            if not entry.name.endswith('.csv') or not entry.is_file():
+                continue
+            for i, keyword in enumerate(keywords):
+                if keyword in entry.name:
+                    mtime = entry.stat().st_mtime
+                    if mtime > best_mtimes[i]:
+                        best_mtimes[i] = mtime
+                        best_paths[i] = entry.path
+    return best_paths
+
+
 def find_latest_csv_files(output_dir):
     """
     查找最新的評論CSV文件
@@ -117,16 +239,8 @@ def find_latest_csv_files(output_dir):
         tuple: (google_play_path, app_store_path) 或 (None, None)
     """
     try:
-        # 查找所有CSV文件
-        csv_files = glob.glob(os.path.join(output_dir, "*.csv"))
-
-        google_play_files = [f for f in csv_files if 'google_play' in os.path.basename(f)]
-        app_store_files = [f for f in csv_files if 'app_store' in os.path.basename(f)]
-
-        # 按修改時間排序，取最新的
-        google_play_path = max(google_play_files, key=os.path.getmtime) if google_play_files else None
-        app_store_path = max(app_store_files, key=os.path.getmtime) if app_store_files else None
-
+        # 單次掃描目錄，按修改時間取最新的
+        google_play_path, app_store_path = _latest_csv_files(output_dir, ('google_play', 'app_store'))
         return google_play_path, app_store_path
 
     except Exception as e:
@@ -149,12 +263,20 @@ def merge_reviews(google_df, app_store_df):
         print("沒有有效的評論數據")
         return pd.DataFrame()
 
-    # 合併DataFrame
-    merged_df = pd.concat([google_df, app_store_df], ignore_index=True)
+    # 合併DataFrame：兩個加載函數的欄位順序一致，無需對齊排序；
+    # 任一方為空時直接沿用另一方，省去一次複製
+    if app_store_df.empty:
+        merged_df = google_df.reset_index(drop=True)
+    elif google_df.empty:
+        merged_df = app_store_df.reset_index(drop=True)
+    else:
+        merged_df = pd.concat([google_df, app_store_df], ignore_index=True, sort=False)
+
+    # 平台僅兩種取值，改用類別型；評分範圍0-5，以int8儲存
+    merged_df = merged_df.astype({'platform': 'category', 'rating': 'int8'})
 
-    # 按時間排序（最新的在前）
+    # 按時間排序（最新的在前）；date 已於加載時解析為 datetime
     try:
-        merged_df['date'] = pd.to_datetime(merged_df['date'], errors='coerce')
         merged_df = merged_df.sort_values('date', ascending=False)
         merged_df['date'] = merged_df['date'].dt.strftime('%Y-%m-%d %H:%M:%S')
     except Exception as e:
@@ -176,18 +298,21 @@ def clean_reviews(df):
     if df.empty:
         return df
 
-    # 移除重複的評論（基於reviewId）
-    df = df.drop_duplicates(subset=['reviewId'], keep='first')
+    # 清理內容文本
+    df = df.assign(
+        content=_to_text(df['content']).str.strip(),
+        userName=_to_text(df['userName']).str.strip(),
+    )
 
-    # 移除無效數據
-    df = df[df['rating'].between(1, 5)]  # 評分應在1-5之間
-    df = df[df['content'].str.len() > 0]  # 內容不為空
+    # 移除無效數據：評分應在1-5之間且內容不為空（單一布林遮罩）
+    mask = df['rating'].between(1, 5) & (df['content'].str.len() > 0)
 
-    # 清理內容文本
-    df['content'] = df['content'].str.strip()
-    df['userName'] = df['userName'].str.strip()
+    # 移除重複的評論（基於reviewId）
+    df = df.loc[mask].drop_duplicates(subset=['reviewId'], keep='first')
 
-    return df
+    # 移除內容相同的評論（如同一則評論同時發佈於兩個平台），以內容雜湊值比對
+    content_hash = pd.util.hash_pandas_object(df['content'], index=False)
+    return df.loc[~content_hash.duplicated(keep='first').to_numpy()]
 
 
 def generate_output_filename():
@@ -201,6 +326,30 @@ def generate_output_filename():
     return f"merged_reviews_{timestamp}.csv"
 
 
+def write_csv_utf8_sig(df, file_path):
+    """
+    以 UTF-8 BOM 編碼寫出CSV（優先使用 pyarrow，未安裝時退回 pandas）
+
+    Args:
+        df (pd.DataFrame): 要寫出的DataFrame
+        file_path (str): 文件路徑
+    """
+    table = None
+    if pacsv is not None:
+        try:
+            table = pa.Table.from_pandas(df, preserve_index=False)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            table = None  # 混合型別欄位無法轉為 Arrow，改用 pandas 寫出
+
+    if table is None:
+        df.to_csv(file_path, index=False, encoding='utf-8-sig')
+        return
+
+    with open(file_path, 'wb') as f:
+        f.write(b'\xef\xbb\xbf')
+        pacsv.write_csv(table, f)
+
+
 def main():
     """主程式"""
 
@@ -274,8 +423,16 @@ def main():
         output_filename = generate_output_filename()
         output_path = os.path.join(output_dir, output_filename)
 
-        cleaned_df.to_csv(output_path, index=False, encoding='utf-8-sig')
+        write_csv_utf8_sig(cleaned_df, output_path)
         print(f"✓ 合併評論已保存: {output_path}")
+
+        # 另存 Parquet 副本，供下一步驟快速讀取
+        if pa is not None:
+            parquet_path = os.path.splitext(output_path)[0] + '.parquet'
+            cleaned_df.to_parquet(
+                parquet_path, engine='pyarrow', compression='zstd', index=False
+            )
+            print(f"✓ Parquet 副本已保存: {parquet_path}")
     else:
         print("✗ 沒有有效的評論數據，跳過保存")
 
@@ -5,13 +5,11 @@
 功能：
 - 讀取合併評論CSV文件
 - 數據清洗：轉換全形符號為半形、移除表情符號、移除短文本
-- 輸出單一的JSON格式文件，用於後續的數據標註
+- 輸出單一的JSON Lines格式文件，用於後續的數據標註
 
-JSON格式：
-[
-    {"text": "評論內容", "primary": "", "secondary": ""},
-    ...
-]
+JSONL格式（每行一條記錄）：
+{"text": "評論內容", "primary": "", "secondary": ""}
+...
 """
 
 import os
@@ -21,31 +19,128 @@ import json
 import re
 from datetime import datetime
 import random
-import glob
 import unicodedata
 
+try:
+    import orjson
+except ImportError:  # 未安裝 orjson 時退回標準庫 json
+    orjson = None
+
+try:
+    import pyarrow  # 讀取 Parquet 所需
+except ImportError:
+    pyarrow = None
+
+
+# 全形轉半形對照表（模組載入時建立一次）
+_FULLWIDTH_CHARS = "０１２３４５６７８９ＡＢＣＤＥＦＧＨＩＪＫＬＭＮＯＰＱＲＳＴＵＶＷＸＹＺａｂｃｄｅｆｇｈｉｊｋｌｍｎｏｐｑｒｓｔｕｖｗｘｙｚ！＂＃＄％＆＇（）＊＋，－．／：；＜＝＞？＠［＼］＾＿｀｛｜｝～　"
+_HALFWIDTH_CHARS = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz!\"#$%&'()*+,-./:;<=>?@[\\]^_`{|}~ "
+_FULLWIDTH_TABLE = str.maketrans(_FULLWIDTH_CHARS, _HALFWIDTH_CHARS)
+
+# 更全面的表情符号Unicode范围（模組載入時合併為單一字元類別）
+_EMOJI_RANGES = (
+    # 基础表情符号
+    '\U0001F600-\U0001F64F',  # emoticons
+    '\U0001F300-\U0001F5FF',  # symbols & pictographs
+    '\U0001F680-\U0001F6FF',  # transport & map symbols
+    '\U0001F1E0-\U0001F1FF',  # flags (iOS)
+
+    # 扩展表情符号范围
+    '\U0001F900-\U0001F9FF',  # supplemental symbols and pictographs
+    '\U0001FA00-\U0001FA6F',  # chess symbols
+    '\U0001FA70-\U0001FAFF',  # symbols and pictographs extended-A
+    '\U00002600-\U000026FF',  # miscellaneous symbols
+    '\U00002700-\U000027BF',  # dingbats
+
+    # 其他相关符号
+    '\U0001F004\U0001F0CF',   # mahjong and playing cards
+    '\U0001F170-\U0001F251',  # enclosed characters
+    '\U0000FE00-\U0000FE0F',  # variation selectors
+    '\U00002000-\U0000206F',  # general punctuation (包括零宽字符, 含 U+200D)
+
+    # 特殊字符
+    '\u2122\u00A9\u00AE',     # trademark, copyright, registered
+
+    # 其他可能的表情符号范围
+    '\U0001F780-\U0001F7FF',  # geometric shapes extended
+    '\U0001F800-\U0001F8FF',  # supplemental arrows-C
+    '\U0001F3FB-\U0001F3FF',  # skin tone modifiers
+)
+_EMOJI_RE = re.compile('[' + ''.join(_EMOJI_RANGES) + ']+')
+
+# 中文字符與連續空白的正則（模組載入時編譯一次）
+_CHINESE_RE = re.compile('[\u4e00-\u9fff]')
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+class _SymbolFilterTable(dict):
+    """
+    供 str.translate 使用的字元過濾表
+    首次遇到某字元時依Unicode類別判斷去留，結果緩存後即由C層直接查表
+    """
+
+    def __missing__(self, codepoint):
+        char = chr(codepoint)
+        category = unicodedata.category(char)
+        # 保留字母、数字、标点、空格、中文等有用字符，但排除高位符号字符
+        keep = (
+            category[0] in ('L', 'N', 'P', 'Z', 'M')
+            or unicodedata.name(char, '').startswith('CJK')
+        ) and not (category == 'So' and codepoint > 0x1F000)
+        value = codepoint if keep else None
+        self[codepoint] = value
+        return value
+
+
+_SYMBOL_FILTER_TABLE = _SymbolFilterTable()
+
+
+def _latest_file(output_dir, prefix, suffix):
+    """
+    單次掃描目錄，找出符合前綴與副檔名的最新文件
+
+    Args:
+        output_dir (str): 目錄路徑
+        prefix (str): 檔名前綴
+        suffix (str): 檔名結尾
+
+    Returns:
+        str: 文件路徑，如果找不到則返回None
+    """
+    best_path = None
+    best_mtime = -1.0
+    with os.scandir(output_dir) as entries:
+        for entry in entries:
+            name = entry.name
+            if name.startswith(prefix) and name.endswith(suffix) and entry.is_file():
+                mtime = entry.stat().st_mtime
+                if mtime > best_mtime:
+                    best_mtime = mtime
+                    best_path = entry.path
+    return best_path
+
 
 def find_merged_reviews_file(output_dir):
     """
-    查找最新的merged_reviews CSV文件
+    查找最新的merged_reviews CSV文件；若同名的 Parquet 副本存在則優先使用
 
     Args:
         output_dir (str): 輸出目錄路徑
 
     Returns:
-        str: CSV文件路徑，如果找不到則返回None
+        str: CSV或Parquet文件路徑，如果找不到則返回None
     """
     try:
-        # 查找所有merged_reviews_*.csv文件
-        pattern = os.path.join(output_dir, "merged_reviews_*.csv")
-        files = glob.glob(pattern)
+        # 單次掃描目錄，按修改時間取最新的merged_reviews_*.csv文件
+        latest_file = _latest_file(output_dir, "merged_reviews_", ".csv")
 
-        if not files:
+        if not latest_file:
             print("✗ 找不到任何merged_reviews文件")
             return None
 
-        # 如果有多個文件，按修改時間排序，取最新的
-        latest_file = max(files, key=os.path.getmtime)
+        parquet_file = os.path.splitext(latest_file)[0] + '.parquet'
+        if pyarrow is not None and os.path.exists(parquet_file):
+            latest_file = parquet_file
         print(f"✓ 找到最新的merged_reviews文件：{os.path.basename(latest_file)}")
         return latest_file
 
@@ -56,16 +151,19 @@ def find_merged_reviews_file(output_dir):
 
 def load_merged_reviews(csv_path):
     """
-    加載合併評論CSV文件
+    加載合併評論CSV（或Parquet）文件
 
     Args:
-        csv_path (str): CSV文件路徑
+        csv_path (str): CSV或Parquet文件路徑
 
     Returns:
         pd.DataFrame: 加載的DataFrame
     """
     try:
-        df = pd.read_csv(csv_path, encoding='utf-8-sig')
+        if csv_path.endswith('.parquet'):
+            df = pd.read_parquet(csv_path)
+        else:
+            df = pd.read_csv(csv_path, encoding='utf-8-sig')
         print(f"✓ 成功加載 {len(df)} 條評論數據")
         return df
     except Exception as e:
@@ -86,10 +184,7 @@ def convert_fullwidth_to_halfwidth(text):
     if not isinstance(text, str):
         return ""
 
-    fullwidth_chars = "０１２３４５６７８９ＡＢＣＤＥＦＧＨＩＪＫＬＭＮＯＰＱＲＳＴＵＶＷＸＹＺａｂｃｄｅｆｇｈｉｊｋｌｍｎｏｐｑｒｓｔｕｖｗｘｙｚ！＂＃＄％＆＇（）＊＋，－．／：；＜＝＞？＠［＼］＾＿｀｛｜｝～　"
-    halfwidth_chars = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz!\"#$%&'()*+,-./:;<=>?@[\\]^_`{|}~ "
-    trans_table = str.maketrans(fullwidth_chars, halfwidth_chars)
-    return text.translate(trans_table)
+    return text.translate(_FULLWIDTH_TABLE)
 
 
 def remove_emojis(text):
@@ -105,62 +200,13 @@ def remove_emojis(text):
     """
     if not isinstance(text, str):
         return ""
-    
-    # 更全面的表情符号Unicode范围
-    emoji_patterns = [
-        # 基础表情符号
-        r'[\U0001F600-\U0001F64F]',  # emoticons
-        r'[\U0001F300-\U0001F5FF]',  # symbols & pictographs
-        r'[\U0001F680-\U0001F6FF]',  # transport & map symbols
-        r'[\U0001F1E0-\U0001F1FF]',  # flags (iOS)
-        
-        # 扩展表情符号范围
-        r'[\U0001F900-\U0001F9FF]',  # supplemental symbols and pictographs
-        r'[\U0001FA00-\U0001FA6F]',  # chess symbols
-        r'[\U0001FA70-\U0001FAFF]',  # symbols and pictographs extended-A
-        r'[\U00002600-\U000026FF]',  # miscellaneous symbols
-        r'[\U00002700-\U000027BF]',  # dingbats
-        
-        # 其他相关符号
-        r'[\U0001F004\U0001F0CF]',   # mahjong and playing cards
-        r'[\U0001F170-\U0001F251]',  # enclosed characters
-        r'[\U0000FE00-\U0000FE0F]',  # variation selectors
-        r'[\U00002000-\U0000206F]',  # general punctuation (包括零宽字符)
-        r'[\U0000200D]',             # zero width joiner
-        r'[\U0000FE0F]',             # variation selector-16
-        
-        # 特殊字符
-        r'[™©®]',                    # trademark, copyright, registered
-        r'[\u2122\u00A9\u00AE]',     # 同上，不同编码
-        
-        # 其他可能的表情符号范围
-        r'[\U0001F780-\U0001F7FF]',  # geometric shapes extended
-        r'[\U0001F800-\U0001F8FF]',  # supplemental arrows-C
-    ]
-    
-    result = text
-    for pattern in emoji_patterns:
-        result = re.sub(pattern, '', result, flags=re.UNICODE)
-    
-    # 额外处理：移除连续的修饰符和组合字符
-    # 这些字符通常与表情符号一起出现
-    modifiers_pattern = r'[\U0001F3FB-\U0001F3FF]+'  # skin tone modifiers
-    result = re.sub(modifiers_pattern, '', result, flags=re.UNICODE)
-    
+
+    # 所有表情符号范围已合并为单一正则，一次扫描完成替换
+    result = _EMOJI_RE.sub('', text)
+
     # 使用unicodedata来识别并移除其他可能的符号字符
-    # 但要保留标点符号和其他有用字符
-    cleaned_chars = []
-    for char in result:
-        # 获取字符的Unicode类别
-        category = unicodedata.category(char)
-        # 保留字母、数字、标点、空格、中文等有用字符
-        if category[0] in ['L', 'N', 'P', 'Z', 'M'] or unicodedata.name(char, '').startswith('CJK'):
-            # 但排除一些特殊符号类别
-            if not (category == 'So' and ord(char) > 0x1F000):  # 排除高位符号字符
-                cleaned_chars.append(char)
-    
-    result = ''.join(cleaned_chars)
-    return result
+    # 但要保留标点符号和其他有用字符（判断结果按字符缓存在翻译表中）
+    return result.translate(_SYMBOL_FILTER_TABLE)
 
 
 def count_chinese_characters(text):
@@ -175,8 +221,7 @@ def count_chinese_characters(text):
     """
     if not isinstance(text, str):
         return 0
-    chinese_pattern = re.compile(r'[\u4e00-\u9fff]')
-    return len(chinese_pattern.findall(text))
+    return sum(1 for _ in _CHINESE_RE.finditer(text))
 
 
 def clean_text(text):
@@ -194,50 +239,72 @@ def clean_text(text):
     text = convert_fullwidth_to_halfwidth(text)
     text = remove_emojis(text)
     # 清理多余的空白字符，但保留单个空格
-    text = re.sub(r'\s+', ' ', text).strip()
+    text = _WHITESPACE_RE.sub(' ', text).strip()
     return text
 
 
-def filter_short_texts(data_list, min_chinese_chars=2):
+def clean_text_series(series):
+    """
+    以整欄方式清理文本，效果等同逐筆呼叫 clean_text
+
+    Args:
+        series (pd.Series): 原始評論內容欄位
+
+    Returns:
+        pd.Series: 清理後的文本（已移除空白內容）
+    """
+    texts = series.dropna().astype(str)
+    texts = texts[texts.str.strip().str.len() > 0]
+    texts = texts.str.translate(_FULLWIDTH_TABLE)
+    texts = texts.str.replace(_EMOJI_RE, '', regex=True)
+    texts = texts.str.translate(_SYMBOL_FILTER_TABLE)
+    # 清理多余的空白字符，但保留单个空格
+    return texts.str.replace(_WHITESPACE_RE, ' ', regex=True).str.strip()
+
+
+def filter_short_texts(df, min_chinese_chars=2):
     """
     過濾掉中文字符數量不足的文本
 
     Args:
-        data_list (list): 數據列表
+        df (pd.DataFrame): 含有 text 欄位的數據表
         min_chinese_chars (int): 最少中文字符數
 
     Returns:
-        list: 過濾後的數據列表
+        pd.DataFrame: 過濾後的數據表
     """
-    filtered_data = []
-    removed_count = 0
-
-    for item in data_list:
-        text = item.get('text', '')
-        chinese_count = count_chinese_characters(text)
-        if chinese_count > min_chinese_chars:
-            filtered_data.append(item)
-        else:
-            removed_count += 1
+    # 一次性以整欄方式計算所有文本的中文字符數
+    chinese_counts = df['text'].str.count(_CHINESE_RE.pattern).fillna(0)
+    filtered_df = df.loc[chinese_counts > min_chinese_chars]
+    removed_count = len(df) - len(filtered_df)
 
     print(f"✓ 移除了 {removed_count} 條短文本（中文字符 ≤ {min_chinese_chars}）")
-    return filtered_data
+    return filtered_df
 
 
-def save_json_file(data, file_path):
+def save_jsonl_file(data, file_path):
     """
-    保存數據為JSON文件
+    保存數據為JSON Lines文件，每行一條記錄，供標註步驟逐行串流讀取
+    （優先使用 orjson，未安裝時退回標準庫 json）
 
     Args:
         data (list): 要保存的數據
         file_path (str): 文件路徑
     """
     try:
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        if orjson is not None:
+            with open(file_path, 'wb') as f:
+                for item in data:
+                    f.write(orjson.dumps(item))
+                    f.write(b'\n')
+        else:
+            with open(file_path, 'w', encoding='utf-8') as f:
+                for item in data:
+                    f.write(json.dumps(item, ensure_ascii=False))
+                    f.write('\n')
         print(f"✓ 已保存 {len(data)} 條數據到 {file_path}")
     except Exception as e:
-        print(f"✗ 保存JSON文件失敗：{e}")
+        print(f"✗ 保存JSONL文件失敗：{e}")
 
 
 def test_emoji_removal():
@@ -298,24 +365,19 @@ def main():
 
     # 2. 數據清洗
     print("2. 數據清洗...")
-    cleaned_data = []
-    for _, row in df.iterrows():
-        original_text = str(row.get('content', ''))
-        if not original_text.strip():
-            continue
-        cleaned_text = clean_text(original_text)
-        data_item = {
-            "text": cleaned_text,
-            "primary": "",
-            "secondary": ""
-        }
-        cleaned_data.append(data_item)
-    print(f"✓ 原始數據: {len(df)} 條，清洗後剩餘: {len(cleaned_data)} 條")
+    cleaned_df = pd.DataFrame({
+        'text': clean_text_series(df['content']).to_numpy(dtype=object),
+        'primary': '',
+        'secondary': '',
+    })
+    print(f"✓ 原始數據: {len(df)} 條，清洗後剩餘: {len(cleaned_df)} 條")
     print()
 
     # 3. 過濾短文本
     print("3. 過濾短文本...")
-    filtered_data = filter_short_texts(cleaned_data, min_chinese_chars=2)
+    filtered_df = filter_short_texts(cleaned_df, min_chinese_chars=2)
+    # 只在寫出前轉換一次為記錄列表
+    filtered_data = filtered_df.to_dict(orient='records')
     print(f"✓ 過濾後數據: {len(filtered_data)} 條")
     print()
 
@@ -324,11 +386,11 @@ def main():
         return
 
     # 4. 保存為待標註文件
-    print("4. 保存為待標註的JSON文件...")
+    print("4. 保存為待標註的JSONL文件...")
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    output_filename = f"unlabeled_reviews_{timestamp}.json"
+    output_filename = f"unlabeled_reviews_{timestamp}.jsonl"
     output_path = os.path.join(output_dir, output_filename)
-    save_json_file(filtered_data, output_path)
+    save_jsonl_file(filtered_data, output_path)
     print()
 
     # 顯示樣例
@@ -341,7 +403,7 @@ def main():
     print("=" * 60)
     print("處理完成總結:")
     print(f"原始評論數量: {len(df)}")
-    print(f"清洗後數量: {len(cleaned_data)}")
+    print(f"清洗後數量: {len(cleaned_df)}")
     print(f"最終有效數據: {len(filtered_data)}")
     print(f"輸出文件: {output_filename}")
     print(f"完成時間: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
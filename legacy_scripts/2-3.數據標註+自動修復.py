@@ -5,36 +5,57 @@
 2-3.數據標註.py（修復＋自動校驗回補循環版，google-genai）
 
 功能總覽：
-- 讀取 output/ 下最新的 unlabeled_reviews_*.json，使用 gemini-2.5-flash 批次分類（結構化輸出）
-- 產生 labeled_reviews_*.json
+- 讀取 output/ 下最新的 unlabeled_reviews_*.jsonl（相容舊版 .json），使用 gemini-2.5-flash 批次分類（結構化輸出）
+- 明顯樣本（空白文字、同類強關鍵字 >= 2）以關鍵字規則直接判定，不送模型
+- 產生 labeled_reviews_*.json（標註過程逐批寫入 labeling_checkpoint_*.jsonl，中斷後重跑可續接）
 - 隨後自動讀取「最新生成的資料集檔案」（預設為剛輸出那個），執行：
     校驗 -> 若有錯誤則列印 10 筆 -> 僅重跑錯誤樣本給 Gemini -> 修復資料集 -> 迴圈直到全數合法
 - 修復後輸出 <原檔名>_fixed.json
 
 安裝：
-  pip install -U google-genai python-dotenv pydantic
+  pip install -U google-genai python-dotenv pydantic pandas orjson
 
 環境變數：
   .env 內設 GEMINI_API_KEY=你的key  （或改用 GOOGLE_API_KEY）
 """
 
 from __future__ import annotations
+import asyncio
+import codecs
+import functools
+import hashlib
 import os
 import json
+import mmap
+import random
+import re
+import sqlite3
+import sys
+import threading
 import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
-from typing import List, Dict, Any, Tuple, Optional
+from typing import List, Dict, Any, Tuple, Optional, Iterator, Callable
 
+import numpy as np
+import pandas as pd
 from dotenv import load_dotenv
 
 # 新版 SDK
 from google import genai
+from google.genai import errors as genai_errors
 from google.genai import types
+import httpx
 
 from pydantic import BaseModel
 from enum import Enum
 
+try:
+    import orjson
+except ImportError:  # 未安裝 orjson 時退回標準庫 json
+    orjson = None
+
 
 # ==============================
 # 基本設定
@@ -45,13 +66,57 @@ if not API_KEY:
     raise ValueError("請在 .env 設定 GEMINI_API_KEY 或 GOOGLE_API_KEY")
 
 MODEL_NAME = "gemini-2.5-flash"
-BATCH_SIZE = 100
+BATCH_SIZE = 300                 # 每批最多評論數
+MAX_INPUT_TOKENS_PER_CALL = 8000 # 每批估計輸入 token 上限（依文字長度動態分批）
+CHARS_PER_TOKEN = 2              # 粗估：中文約每 1~2 字元一個 token
+OUTPUT_TOKENS_PER_REVIEW = 120   # 每筆 {"primary","secondary"} 輸出預留的 token
+MAX_OUTPUT_TOKENS = 60000
 MAX_RETRIES = 5
-RETRY_DELAY_SEC = 30
+# 重試：僅針對暫時性錯誤，指數退避 + 隨機抖動
+RETRY_BASE_DELAY_SEC = 2
+RETRY_MAX_DELAY_SEC = 60
+RETRY_JITTER_SEC = 1.0
+RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+# 事件迴圈或 httpx 用戶端已關閉時拋出的 RuntimeError 訊息：換一個新用戶端後重試即可
+STALE_CLIENT_MARKERS = ("event loop is closed", "client has been closed")
+
+# 同時進行中的 API 請求上限
+MAX_INFLIGHT = 8
+
+# 每分鐘最多送出的 API 請求數（依帳號配額調整；0 表示不限制）
+REQUESTS_PER_MINUTE = 60
+
+# 單次 API 請求逾時（毫秒）
+HTTP_TIMEOUT_MS = 60_000
 
 # 校驗＋回補的最大循環回合數（防止極端情況無限迴圈）
 VALIDATE_MAX_ROUNDS = 8
 
+# 標註進度檢查點：每完成 N 個批次強制落盤一次
+CHECKPOINT_FSYNC_EVERY = 5
+
+# 本地標註快取（位於 output/ 下）；相同評論文字直接取用已標註結果，不重複呼叫 API
+LABEL_CACHE_FILENAME = "label_cache.sqlite3"
+
+
+# 回應文字清理：一次比對去除 ``` 圍欄（含結尾的多個圍欄行）與結尾分號
+_FENCE_RE = re.compile(r"```[^\n]*(?:\n(.*?))??(?:\n[^\S\n]*```[^\n]*)*", re.DOTALL)
+_TRAIL_SEMI_RE = re.compile(r"\s*;\Z")
+
+
+# ==============================
+# JSON 編解碼（優先使用 orjson）
+# ==============================
+def _json_loads(data: bytes | str) -> Any:
+    # orjson.JSONDecodeError 為 json.JSONDecodeError 的子類別，呼叫端可沿用同一個 except
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+def _json_dumpb(obj: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False).encode("utf-8")
+
 
 # ==============================
 # 正確的結構化輸出 Schema（6 × 4）
@@ -77,9 +142,9 @@ class LabelPair(BaseModel):
     secondary: SecondaryCategory
 
 
-# 允許值集合（大小寫嚴格）
-PRIMARY_ALLOW = {e.value for e in PrimaryCategory}
-SECONDARY_ALLOW = {e.value for e in SecondaryCategory}
+# 允許值集合（大小寫嚴格）；字串先 intern，與正規化結果共用同一物件
+PRIMARY_ALLOW = frozenset(sys.intern(e.value) for e in PrimaryCategory)
+SECONDARY_ALLOW = frozenset(sys.intern(e.value) for e in SecondaryCategory)
 
 # 同義詞/寫法正規化映射（模型若輸出非白名單，先嘗試映射；最後仍有保底）
 PRIMARY_MAP = {
@@ -127,8 +192,11 @@ SECONDARY_MAP = {
     "NOTIFICATION": "GENERAL",
 }
 
+# 正規化鍵值用的字元轉換表："-" 轉 "_"，移除空白與 "."
+_NORM_TABLE = str.maketrans({"-": "_", " ": None, ".": None})
+
 
-def _normalize_enum(value: Any, allow: set, mapping: Dict[str, str], fallback: str) -> str:
+def _normalize_enum(value: Any, allow: frozenset, mapping: Dict[str, str], fallback: str) -> str:
     """
     把模型輸出的自由文字，正規化為白名單中的枚舉字面值。
     嚴格大小寫；若非白名單則嘗試映射；否則回退 fallback。
@@ -137,13 +205,188 @@ def _normalize_enum(value: Any, allow: set, mapping: Dict[str, str], fallback: s
         v = value.strip()
         if v in allow:
             return v
-        key = v.upper().replace("-", "_").replace(" ", "").replace(".", "")
-        if key in mapping:
-            mapped = mapping[key]
-            return mapped if mapped in allow else fallback
+        mapped = mapping.get(v.upper().translate(_NORM_TABLE), fallback)
+        return mapped if mapped in allow else fallback
     return fallback
 
 
+# 標籤取值空間很小，正規化結果以快取保存，同一字串只計算一次；
+# 結果經 intern 後，所有標註共用同一組字串物件
+@functools.lru_cache(maxsize=4096)
+def _normalize_primary(value: str) -> str:
+    return sys.intern(_normalize_enum(value, PRIMARY_ALLOW, PRIMARY_MAP, fallback="INVALID"))
+
+
+@functools.lru_cache(maxsize=4096)
+def _normalize_secondary(value: str) -> str:
+    return sys.intern(_normalize_enum(value, SECONDARY_ALLOW, SECONDARY_MAP, fallback="GENERAL"))
+
+
+# ==============================
+# 規則預分類（明顯樣本不送模型）
+# ==============================
+# 各主類別的強關鍵字（小寫比對）
+RULE_PRIMARY_KEYWORDS: Dict[str, Tuple[str, ...]] = {
+    "BUG": ("閃退", "當機", "crash", "bug", "錯誤", "打不開", "無法開啟", "error", "異常"),
+    "PERFORMANCE": ("卡頓", "很慢", "太慢", "lag", "slow", "延遲", "載入很久", "跑不動"),
+    "POSITIVE": ("好用", "方便", "很棒", "推推", "讚", "great", "love", "excellent", "感謝"),
+}
+# 出現任一否定/抱怨字眼時不判為 POSITIVE（如「不好用」「不方便」）
+RULE_NEGATION_MARKERS = ("不", "沒", "沒有", "難用", "爛", "差", "but", "not")
+RULE_SECONDARY_KEYWORDS: Dict[str, Tuple[str, ...]] = {
+    "CREDIT_CARD": ("信用卡", "刷卡", "帳單", "紅利", "credit card"),
+    "TRANSACTION": ("轉帳", "付款", "支付", "掃碼", "匯款", "transfer", "payment"),
+    "ACCOUNT": ("登入", "帳號", "密碼", "餘額", "login", "account"),
+}
+RULE_MIN_KEYWORDS = 2  # 單一主類別至少命中的相異關鍵字數
+
+_KeywordMatcher = Tuple[Tuple[str, ...], Optional[re.Pattern]]
+
+
+def _compile_keywords(keywords: Tuple[str, ...]) -> _KeywordMatcher:
+    """
+    英文關鍵字合併為一條以字詞邊界比對的正規式（避免 bug 命中 debug、lag 命中 flag）；
+    re.ASCII 讓中英夾雜的「一直crash」仍算邊界。中文關鍵字維持子字串比對。
+    """
+    ascii_kws = tuple(kw for kw in keywords if kw.isascii())
+    cjk_kws = tuple(kw for kw in keywords if not kw.isascii())
+    pattern = None
+    if ascii_kws:
+        pattern = re.compile(r"\b(?:" + "|".join(map(re.escape, ascii_kws)) + r")\b", re.ASCII)
+    return cjk_kws, pattern
+
+
+def _count_keywords(text: str, matcher: _KeywordMatcher) -> int:
+    """回傳 text 命中的相異關鍵字數。"""
+    cjk_kws, pattern = matcher
+    n = sum(1 for kw in cjk_kws if kw in text)
+    if pattern is not None:
+        n += len(set(pattern.findall(text)))
+    return n
+
+
+_RULE_PRIMARY_MATCHERS = {label: _compile_keywords(kws) for label, kws in RULE_PRIMARY_KEYWORDS.items()}
+_RULE_NEGATION_MATCHER = _compile_keywords(RULE_NEGATION_MARKERS)
+_RULE_SECONDARY_MATCHERS = {label: _compile_keywords(kws) for label, kws in RULE_SECONDARY_KEYWORDS.items()}
+
+
+def _rule_label(text: str) -> Optional[Dict[str, str]]:
+    """
+    以關鍵字規則判斷明顯樣本；無把握時回傳 None（交給模型）。
+    - 空白文字 -> INVALID / GENERAL
+    - 僅單一主類別命中，且命中數 >= RULE_MIN_KEYWORDS 時才採用
+    """
+    t = text.strip().lower()
+    if not t:
+        return {"primary": "INVALID", "secondary": "GENERAL"}
+
+    hits = {label: _count_keywords(t, matcher) for label, matcher in _RULE_PRIMARY_MATCHERS.items()}
+    matched = [label for label, n in hits.items() if n]
+    if len(matched) != 1:
+        return None
+    primary = matched[0]
+    if primary == "POSITIVE" and _count_keywords(t, _RULE_NEGATION_MATCHER):
+        return None
+    if hits[primary] < RULE_MIN_KEYWORDS:
+        return None
+
+    secondary = "GENERAL"
+    for label, matcher in _RULE_SECONDARY_MATCHERS.items():
+        if _count_keywords(t, matcher):
+            secondary = label
+            break
+    return {"primary": primary, "secondary": secondary}
+
+
+# ==============================
+# 共用 API 用戶端
+# ==============================
+def _create_client(api_key: str) -> genai.Client:
+    return genai.Client(
+        api_key=api_key,
+        http_options=types.HttpOptions(timeout=HTTP_TIMEOUT_MS),
+    )
+
+
+
+class AsyncRateLimiter:
+    """
+    非同步速率限制器：把請求平均分散在每分鐘 rate_per_minute 個時段內放行。
+    """
+    def __init__(self, rate_per_minute: int):
+        self.interval = 60.0 / rate_per_minute if rate_per_minute > 0 else 0.0
+        self._next_slot = 0.0
+
+    async def acquire(self) -> None:
+        if not self.interval:
+            return
+        now = time.monotonic()
+        wait = self._next_slot - now
+        self._next_slot = max(now, self._next_slot) + self.interval
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+class LabelCache:
+    """
+    以內容雜湊為鍵的本地標註快取（SQLite）。
+    鍵包含模型名稱與系統說明，任何一項變更都不會誤用舊結果。
+    """
+    _QUERY_CHUNK = 500  # 單次 IN 查詢的參數上限
+
+    def __init__(self, path: Path):
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS labels ("
+            "key TEXT PRIMARY KEY, primary_label TEXT NOT NULL, secondary_label TEXT NOT NULL)"
+        )
+        self._conn.commit()
+        self._lock = threading.Lock()
+
+    def get_many(self, keys: List[str]) -> Dict[str, Dict[str, str]]:
+        found: Dict[str, Dict[str, str]] = {}
+        with self._lock:
+            for start in range(0, len(keys), self._QUERY_CHUNK):
+                chunk = keys[start:start + self._QUERY_CHUNK]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT key, primary_label, secondary_label FROM labels WHERE key IN ({placeholders})",
+                    chunk,
+                )
+                for key, primary, secondary in rows:
+                    found[key] = {"primary": primary, "secondary": secondary}
+        return found
+
+    def put_many(self, items: List[Tuple[str, Dict[str, str]]]) -> None:
+        if not items:
+            return
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO labels VALUES (?, ?, ?)",
+                [(key, label["primary"], label["secondary"]) for key, label in items],
+            )
+
+
+def _is_stale_client_error(exc: Exception) -> bool:
+    return isinstance(exc, RuntimeError) and any(m in str(exc).lower() for m in STALE_CLIENT_MARKERS)
+
+
+def _is_retryable(exc: Exception) -> bool:
+    """
+    只有 429/5xx、逾時、連線類錯誤與用戶端已關閉值得重試；
+    其餘 4xx（金鑰、請求格式等）重試也不會成功。
+    """
+    if isinstance(exc, genai_errors.APIError):
+        return exc.code in RETRYABLE_STATUS_CODES
+    if _is_stale_client_error(exc):
+        return True
+    return isinstance(exc, (httpx.TransportError, asyncio.TimeoutError, TimeoutError, ConnectionError))
+
+
+def _retry_delay(attempt: int) -> float:
+    return min(RETRY_MAX_DELAY_SEC, RETRY_BASE_DELAY_SEC * 2 ** attempt) + random.uniform(0, RETRY_JITTER_SEC)
+
+
 # ==============================
 # 標註器
 # ==============================
@@ -152,9 +395,15 @@ class GeminiAnnotator:
     使用 google-genai 完成分類，強制 JSON 結構輸出。
     僅要求回傳 [ { "primary": "...", "secondary": "..." }, ... ]
     """
-    def __init__(self, api_key: str, model_name: str = MODEL_NAME):
-        self.client = genai.Client(api_key=api_key)
+    def __init__(self, api_key: str, model_name: str = MODEL_NAME, cache_path: Path | None = None):
+        # 同一標註器的所有批次共用一個連線池；非同步連線池綁定首次使用它的事件迴圈，
+        # 每次 asyncio.run 結束前會關閉，下一次在新迴圈上改建新用戶端（見 annotate_batches_async）
+        self._api_key = api_key
+        self.client = _create_client(api_key)
+        self._client_loop: Optional[asyncio.AbstractEventLoop] = None
         self.model = model_name
+        self.rate_limiter = AsyncRateLimiter(REQUESTS_PER_MINUTE)
+        self.cache = LabelCache(cache_path) if cache_path else None
 
         # 系統說明：固定輸出格式＋決策規則
         self.system_instruction = (
@@ -170,12 +419,13 @@ class GeminiAnnotator:
             "3) Primary & Secondary are independent; not hierarchical.\n"
             "4) If ambiguous, use INVALID (primary) and GENERAL (secondary).\n"
         )
+        self._cache_prefix = f"{self.model}|{hashlib.blake2b(self.system_instruction.encode('utf-8'), digest_size=8).hexdigest()}|"
 
         self.config = types.GenerateContentConfig(
             system_instruction=self.system_instruction,
             temperature=0.1,
             top_p=0.9,
-            max_output_tokens=60000,
+            max_output_tokens=MAX_OUTPUT_TOKENS,
             response_mime_type="application/json",
             response_schema=list[LabelPair],  # 嚴格要求 [LabelPair]
             safety_settings=[
@@ -201,25 +451,30 @@ class GeminiAnnotator:
     @staticmethod
     def _clean_json_text(text: str) -> str:
         stripped = text.strip()
-        if stripped.startswith("```"):
-            lines = stripped.splitlines()
-            if lines:
-                lines = lines[1:]
-                while lines and lines[-1].strip().startswith("```"):
-                    lines = lines[:-1]
-            stripped = "\n".join(lines).strip()
-        if stripped.endswith(";"):
-            stripped = stripped[:-1].rstrip()
-        return stripped
+        fenced = _FENCE_RE.fullmatch(stripped)
+        if fenced:
+            stripped = (fenced.group(1) or "").strip()
+        return _TRAIL_SEMI_RE.sub("", stripped, count=1)
+
+    @staticmethod
+    def _labelpair_to_dict(lp: LabelPair) -> Dict[str, str]:
+        primary = lp.primary
+        secondary = lp.secondary
+        return {
+            "primary": primary.value if isinstance(primary, Enum) else str(primary),
+            "secondary": secondary.value if isinstance(secondary, Enum) else str(secondary),
+        }
 
     def _convert_to_label_dict(self, item: Any) -> Dict[str, str] | None:
+        # 結構化輸出最常見的型別：直接讀屬性，不經 model_dump
+        if type(item) is LabelPair:
+            return self._labelpair_to_dict(item)
+
         if item is None:
             return None
 
-        if isinstance(item, LabelPair):
+        if isinstance(item, BaseModel):
             data: Dict[str, Any] = item.model_dump()
-        elif isinstance(item, BaseModel):
-            data = item.model_dump()
         elif isinstance(item, dict):
             data = item
         else:
@@ -262,7 +517,7 @@ class GeminiAnnotator:
         if isinstance(data, str):
             clean = self._clean_json_text(data)
             try:
-                data = json.loads(clean)
+                data = _json_loads(clean)
             except json.JSONDecodeError:
                 print("錯誤：回應不是合法 JSON。原始回應（前 500 字）：", clean[:500])
                 return None
@@ -294,59 +549,57 @@ class GeminiAnnotator:
 
         return items or None
 
+    def _payload_from_part(self, part: Any) -> Optional[str]:
+        text_part = getattr(part, "text", None)
+        if text_part:
+            stripped = self._clean_json_text(str(text_part))
+            if stripped:
+                return stripped
+
+        func_call = getattr(part, "function_call", None)
+        args = getattr(func_call, "args", None) if func_call else None
+        if isinstance(args, dict):
+            for key in ("json", "response", "output", "data", "labels", "result"):
+                if key not in args:
+                    continue
+                value = args[key]
+                if isinstance(value, str):
+                    cleaned = self._clean_json_text(value)
+                    if cleaned:
+                        return cleaned
+                    continue
+                try:
+                    return json.dumps(value, ensure_ascii=False)
+                except TypeError:
+                    continue
+
+        func_response = getattr(part, "function_response", None)
+        response_payload = getattr(func_response, "response", None) if func_response else None
+        if response_payload:
+            try:
+                return json.dumps(response_payload, ensure_ascii=False)
+            except TypeError:
+                return None
+        return None
+
     def _extract_json_payload(self, resp: Any) -> Optional[str]:
         if not resp:
             return None
 
+        # 最常見的情況：resp.text 即為 JSON
         text_attr = getattr(resp, "text", None)
         if text_attr:
             stripped = self._clean_json_text(str(text_attr))
             if stripped:
                 return stripped
 
-        def iter_parts():
-            response_parts = getattr(resp, "parts", None) or []
-            for part in response_parts:
-                yield part
-            candidates = getattr(resp, "candidates", None) or []
-            for candidate in candidates:
-                content = getattr(candidate, "content", None)
-                if content:
-                    for part in getattr(content, "parts", None) or []:
-                        yield part
-
-        for part in iter_parts():
-            text_part = getattr(part, "text", None)
-            if text_part:
-                stripped = self._clean_json_text(str(text_part))
-                if stripped:
-                    return stripped
-
-            func_call = getattr(part, "function_call", None)
-            if func_call:
-                args = getattr(func_call, "args", None) or {}
-                if isinstance(args, dict):
-                    for key in ("json", "response", "output", "data", "labels", "result"):
-                        if key in args:
-                            value = args[key]
-                            if isinstance(value, str):
-                                cleaned = self._clean_json_text(value)
-                                if cleaned:
-                                    return cleaned
-                            else:
-                                try:
-                                    return json.dumps(value, ensure_ascii=False)
-                                except TypeError:
-                                    continue
-
-            func_response = getattr(part, "function_response", None)
-            if func_response:
-                response_payload = getattr(func_response, "response", None)
-                if response_payload:
-                    try:
-                        return json.dumps(response_payload, ensure_ascii=False)
-                    except TypeError:
-                        pass
+        # resp.parts 只是 candidates[0].content.parts 的捷徑，直接逐一檢查 candidates 的 parts
+        for candidate in getattr(resp, "candidates", None) or ():
+            content = getattr(candidate, "content", None)
+            for part in (getattr(content, "parts", None) if content else None) or ():
+                payload = self._payload_from_part(part)
+                if payload:
+                    return payload
 
         return None
 
@@ -388,24 +641,37 @@ class GeminiAnnotator:
         except Exception:
             pass
 
-    def _call_model_once(self, texts: List[str]) -> List[dict]:
+    def _config_for(self, n_reviews: int) -> types.GenerateContentConfig:
         """
-        單次呼叫模型。輸入多筆 text，輸出為 List[{"primary":..., "secondary":...}].
+        依批次筆數設定 max_output_tokens，避免每次都預留最大輸出額度。
         """
-        payload = {"reviews": [{"text": t} for t in texts]}
-        prompt = (
-            "Classify the following reviews.\n"
-            "Return ONLY the JSON array of objects with keys {primary, secondary} as per schema.\n"
-            f"Input:\n{json.dumps(payload, ensure_ascii=False)}"
-        )
+        max_tokens = min(MAX_OUTPUT_TOKENS, n_reviews * OUTPUT_TOKENS_PER_REVIEW)
+        return self.config.model_copy(update={"max_output_tokens": max_tokens})
 
-        resp = self.client.models.generate_content(
-            model=self.model,
-            contents=prompt,
-            config=self.config,
+    @staticmethod
+    def _build_prompt(texts: List[str]) -> str:
+        # 以編號純文字列出評論，不包 JSON 外層結構，省下跳脫與鍵名的輸入 token
+        numbered = "\n".join(
+            f"{i}. {' '.join(t.splitlines())}" for i, t in enumerate(texts, start=1)
+        )
+        return (
+            f"Classify the following {len(texts)} reviews.\n"
+            "Return ONLY the JSON array of objects with keys {primary, secondary} as per schema, "
+            "one object per review in the same order.\n"
+            f"Input:\n{numbered}"
         )
 
-        parsed = self._coerce_label_items(getattr(resp, "parsed", None))
+    def _parse_response(self, resp: Any) -> List[dict]:
+        # 快速路徑：SDK 已依 response_schema 反序列化為 LabelPair，直接取值，不再重新解析 JSON
+        parsed_objects = getattr(resp, "parsed", None)
+        if (
+            isinstance(parsed_objects, list)
+            and parsed_objects
+            and all(type(lp) is LabelPair for lp in parsed_objects)
+        ):
+            return [self._labelpair_to_dict(lp) for lp in parsed_objects]
+
+        parsed = self._coerce_label_items(parsed_objects)
         if parsed:
             return parsed
 
@@ -418,6 +684,71 @@ class GeminiAnnotator:
         self._log_response_debug(resp)
         return []
 
+    def _lookup_cache(self, texts: List[str]) -> Tuple[List[Optional[dict]], List[str], List[int]]:
+        """
+        查詢快取，回傳 (依輸入順序的標籤或 None, 快取鍵, 需送模型的位置)。
+        """
+        if self.cache is None:
+            return [None] * len(texts), [], list(range(len(texts)))
+        keys = [
+            hashlib.blake2b((self._cache_prefix + t).encode("utf-8"), digest_size=16).hexdigest()
+            for t in texts
+        ]
+        found = self.cache.get_many(keys)
+        labels = [found.get(k) for k in keys]
+        misses = [i for i, label in enumerate(labels) if label is None]
+        return labels, keys, misses
+
+    def _fill_from_response(
+        self,
+        labels: List[Optional[dict]],
+        keys: List[str],
+        misses: List[int],
+        out: List[dict],
+    ) -> List[dict]:
+        """
+        將模型輸出填回未命中的位置；筆數完全相符時才寫入快取。
+        """
+        if not out:
+            return []
+        if len(out) != len(misses):
+            print(f"警告：模型回傳 {len(out)} 筆與輸入 {len(misses)} 筆不符，使用預設標籤補齊。")
+        elif self.cache is not None:
+            self.cache.put_many(list(zip((keys[i] for i in misses), self._post_sanitize(out))))
+        for i, label in zip(misses, out):
+            labels[i] = label
+        return [label if label is not None else {} for label in labels]
+
+    def _call_model_once(self, texts: List[str]) -> List[dict]:
+        """
+        單次呼叫模型。輸入多筆 text，輸出為 List[{"primary":..., "secondary":...}].
+        快取命中的 text 不會送出。
+        """
+        labels, keys, misses = self._lookup_cache(texts)
+        if not misses:
+            return labels
+        resp = self.client.models.generate_content(
+            model=self.model,
+            contents=self._build_prompt([texts[i] for i in misses]),
+            config=self._config_for(len(misses)),
+        )
+        return self._fill_from_response(labels, keys, misses, self._parse_response(resp))
+
+    async def _call_model_once_async(self, texts: List[str]) -> List[dict]:
+        """
+        _call_model_once 的非同步版本，使用 google-genai 的 aio 用戶端。
+        """
+        labels, keys, misses = self._lookup_cache(texts)
+        if not misses:
+            return labels
+        await self.rate_limiter.acquire()
+        resp = await self.client.aio.models.generate_content(
+            model=self.model,
+            contents=self._build_prompt([texts[i] for i in misses]),
+            config=self._config_for(len(misses)),
+        )
+        return self._fill_from_response(labels, keys, misses, self._parse_response(resp))
+
 
     def _post_sanitize(self, raw_items: List[dict]) -> List[dict]:
         """
@@ -425,89 +756,282 @@ class GeminiAnnotator:
         """
         sanitized: List[dict] = []
         for it in raw_items:
-            p = _normalize_enum(it.get("primary"), PRIMARY_ALLOW, PRIMARY_MAP, fallback="INVALID")
-            s = _normalize_enum(it.get("secondary"), SECONDARY_ALLOW, SECONDARY_MAP, fallback="GENERAL")
-            sanitized.append({"primary": p, "secondary": s})
+            p = it.get("primary")
+            s = it.get("secondary")
+            sanitized.append({
+                "primary": _normalize_primary(p) if isinstance(p, str) else "INVALID",
+                "secondary": _normalize_secondary(s) if isinstance(s, str) else "GENERAL",
+            })
         return sanitized
 
+    def _merge_labels(self, reviews: List[dict], out: List[dict]) -> List[dict]:
+        """
+        將模型輸出按順序直接寫回原始 review（就地更新，不複製整個 dict）；
+        筆數不足時以預設標籤補齊。
+        """
+        out = self._post_sanitize(out)
+        n = min(len(out), len(reviews))
+        for r, label in zip(reviews, out):
+            r["primary"] = label["primary"]
+            r["secondary"] = label["secondary"]
+            r.setdefault("text", "")
+        if len(out) != len(reviews):
+            print(f"警告：模型回傳 {len(out)} 筆與輸入 {len(reviews)} 筆不符，使用預設標籤補齊。")
+        for r in reviews[n:]:
+            r["primary"] = "INVALID"
+            r["secondary"] = "GENERAL"
+            r.setdefault("text", "")
+        return reviews
+
+    @staticmethod
+    def _apply_rules(reviews: List[dict]) -> List[dict]:
+        """
+        對規則可判定的 review 直接就地寫入標籤，回傳其餘需送模型的 review（保持原順序）。
+        """
+        hard: List[dict] = []
+        for r in reviews:
+            label = _rule_label(str(r.get("text", "")))
+            if label is None:
+                hard.append(r)
+            else:
+                r.update(label)
+                r.setdefault("text", "")
+        return hard
+
+    @staticmethod
+    def _fallback_labels(reviews: List[dict]) -> List[dict]:
+        print("此批次標註失敗，保留原始資料。")
+        for r in reviews:
+            r["primary"] = "INVALID"
+            r["secondary"] = "GENERAL"
+            r.setdefault("text", "")
+        return reviews
 
     def annotate_batch(self, reviews: List[dict]) -> List[dict]:
         """
         將一批 review dict（至少含 'text'）送模型，回傳標註後的列表。
-        具備重試、與標籤正規化。
+        具備重試、與標籤正規化；規則可判定的明顯樣本不送模型。
         """
-        texts = [str(r.get("text", "")) for r in reviews]
-        attempt = 0
-        while attempt < MAX_RETRIES:
+        hard = self._apply_rules(reviews)
+        if not hard:
+            return reviews
+        texts = [str(r.get("text", "")) for r in hard]
+        for attempt in range(MAX_RETRIES):
             try:
                 out = self._call_model_once(texts)
                 if out and isinstance(out, list):
-                    out = self._post_sanitize(out)
-                    n = min(len(out), len(reviews))
-                    merged: List[dict] = []
-                    for i in range(n):
-                        item = {
-                            **reviews[i],
-                            "primary": out[i].get("primary"),
-                            "secondary": out[i].get("secondary"),
-                        }
-                        item["text"] = reviews[i].get("text", "")
-                        merged.append(item)
-                    if len(out) != len(reviews):
-                        print(f"警告：模型回傳 {len(out)} 筆與輸入 {len(reviews)} 筆不符，使用預設標籤補齊。")
-                    for i in range(n, len(reviews)):
-                        merged.append({
-                            **reviews[i],
-                            "primary": "INVALID",
-                            "secondary": "GENERAL",
-                            "text": reviews[i].get("text", ""),
-                        })
-                    if merged:
-                        return merged
+                    self._merge_labels(hard, out)
+                    return reviews
             except Exception as e:
                 print(f"第 {attempt + 1} 次呼叫 API 失敗: {e}")
-                if attempt + 1 >= MAX_RETRIES:
+                if not _is_retryable(e):
+                    print("非暫時性錯誤，不再重試。")
                     break
 
-            attempt += 1
-            print(f"重試中（{attempt}/{MAX_RETRIES}）…")
-            time.sleep(RETRY_DELAY_SEC)
+            if attempt + 1 >= MAX_RETRIES:
+                break
+            delay = _retry_delay(attempt)
+            print(f"重試中（{attempt + 1}/{MAX_RETRIES}），{delay:.1f} 秒後…")
+            time.sleep(delay)
 
-        print("此批次標註失敗，保留原始資料。")
-        fallback = []
-        for r in reviews:
-            fallback.append({
-                **r,
-                "primary": "INVALID",
-                "secondary": "GENERAL",
-                "text": r.get("text", "")
-            })
-        return fallback
+        self._fallback_labels(hard)
+        return reviews
+
+    async def annotate_batch_async(self, reviews: List[dict]) -> Tuple[List[dict], bool]:
+        """
+        annotate_batch 的非同步版本，重試等待不會阻塞其他批次。
+        回傳 (標註結果, 是否成功)；重試用盡而改填預設標籤時為 False，呼叫端不應視為已完成。
+        """
+        hard = self._apply_rules(reviews)
+        if not hard:
+            return reviews, True
+        texts = [str(r.get("text", "")) for r in hard]
+        for attempt in range(MAX_RETRIES):
+            client = self.client
+            try:
+                out = await self._call_model_once_async(texts)
+                if out and isinstance(out, list):
+                    self._merge_labels(hard, out)
+                    return reviews, True
+            except Exception as e:
+                print(f"第 {attempt + 1} 次呼叫 API 失敗: {e}")
+                if _is_stale_client_error(e) and self.client is client:
+                    # 同時失敗的其他批次只需換一次用戶端
+                    self.client = _create_client(self._api_key)
+                if not _is_retryable(e):
+                    print("非暫時性錯誤，不再重試。")
+                    break
+
+            if attempt + 1 >= MAX_RETRIES:
+                break
+            delay = _retry_delay(attempt)
+            print(f"重試中（{attempt + 1}/{MAX_RETRIES}），{delay:.1f} 秒後…")
+            await asyncio.sleep(delay)
+
+        self._fallback_labels(hard)
+        return reviews, False
+
+    async def annotate_batches_async(
+        self,
+        batches: List[List[dict]],
+        max_inflight: int = MAX_INFLIGHT,
+        on_result: Optional[Callable[[int, List[dict], bool], None]] = None,
+    ) -> List[List[dict]]:
+        """
+        同時送出多個批次（最多 max_inflight 個同時進行），結果依輸入順序回傳。
+        on_result(批次索引, 標註結果, 是否成功) 會在每個批次完成時立即呼叫，可用於增量存檔。
+        """
+        loop = asyncio.get_running_loop()
+        if self._client_loop is not None and self._client_loop is not loop:
+            self.client = _create_client(self._api_key)
+        self._client_loop = loop
+        semaphore = asyncio.BoundedSemaphore(max_inflight)
+
+        async def label_one(batch_idx: int, batch: List[dict]) -> List[dict]:
+            async with semaphore:
+                labeled, ok = await self.annotate_batch_async(batch)
+            if on_result is not None:
+                on_result(batch_idx, labeled, ok)
+            return labeled
+
+        try:
+            return await asyncio.gather(*(label_one(i, batch) for i, batch in enumerate(batches)))
+        finally:
+            # asyncio.run 返回時會關閉事件迴圈，須趁迴圈仍在時釋放非同步連線池
+            await self.client.aio.aclose()
+
+
+# ==============================
+# 動態分批
+# ==============================
+def _estimate_tokens(text: Any) -> int:
+    return len(str(text)) // CHARS_PER_TOKEN + 1
+
+
+def _pack_batches(
+    reviews: List[dict],
+    max_items: int = BATCH_SIZE,
+    max_in_tokens: int = MAX_INPUT_TOKENS_PER_CALL,
+    max_out_tokens: int = MAX_OUTPUT_TOKENS,
+) -> List[Tuple[int, int]]:
+    """
+    依估計的輸入 token 數把 reviews 切成連續區段，回傳 [(start, end), ...]。
+    每段同時受筆數上限與輸出 token 額度限制；單筆超過上限時自成一段。
+    """
+    max_items = max(1, min(max_items, max_out_tokens // OUTPUT_TOKENS_PER_REVIEW))
+    spans: List[Tuple[int, int]] = []
+    start = 0
+    tokens = 0
+    for i, r in enumerate(reviews):
+        cost = _estimate_tokens(r.get("text", ""))
+        if i > start and (tokens + cost > max_in_tokens or i - start >= max_items):
+            spans.append((start, i))
+            start = i
+            tokens = 0
+        tokens += cost
+    if start < len(reviews):
+        spans.append((start, len(reviews)))
+    return spans
 
 
 # ==============================
 # I/O 工具
 # ==============================
+def _latest_file(output_dir: Path, prefix: str, suffix: str | Tuple[str, ...]) -> Path | None:
+    """
+    單次 os.scandir 掃描目錄，找出符合前綴與結尾的最新檔案（stat 由目錄項目提供）。
+    """
+    best_path = None
+    best_mtime = -1.0
+    with os.scandir(output_dir) as entries:
+        for entry in entries:
+            name = entry.name
+            if name.startswith(prefix) and name.endswith(suffix) and entry.is_file():
+                mtime = entry.stat().st_mtime
+                if mtime > best_mtime:
+                    best_mtime = mtime
+                    best_path = entry.path
+    return Path(best_path) if best_path else None
+
+
 def find_latest_unlabeled_file(output_dir: Path) -> Path | None:
-    files = list(output_dir.glob("unlabeled_reviews_*.json"))
-    if not files:
-        return None
-    return max(files, key=lambda p: p.stat().st_mtime)
+    # 同時涵蓋新版 .jsonl 與舊版 .json
+    return _latest_file(output_dir, "unlabeled_reviews_", (".jsonl", ".json"))
 
 
 def find_latest_labeled_file(output_dir: Path) -> Path | None:
-    files = list(output_dir.glob("labeled_reviews_*.json"))
-    if not files:
-        return None
-    return max(files, key=lambda p: p.stat().st_mtime)
+    return _latest_file(output_dir, "labeled_reviews_", ".json")
+
+
+def iter_jsonl(path: Path) -> Iterator[dict]:
+    """
+    逐行串流讀取 JSON Lines 檔，不需一次載入整個檔案內容。
+    """
+    with open(path, "rb") as f:
+        for line in f:
+            if line.strip():
+                yield _json_loads(line)
+
+
+def _load_json_mapped(path: Path) -> Any:
+    """
+    以 mmap 映射檔案後直接交給 orjson 解析，不先讀成一份 bytes/str 副本；
+    未安裝 orjson 時退回標準庫 json。
+    """
+    if orjson is None or path.stat().st_size == 0:
+        with open(path, "r", encoding="utf-8-sig") as f:
+            return json.load(f)
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        offset = len(codecs.BOM_UTF8) if mm[:3] == codecs.BOM_UTF8 else 0
+        with memoryview(mm)[offset:] as view:
+            return orjson.loads(view)
 
 
 def load_reviews(path: Path) -> List[dict]:
-    with open(path, "r", encoding="utf-8") as f:
-        return json.load(f)
+    if path.suffix == ".jsonl":
+        return list(iter_jsonl(path))
+    return _load_json_mapped(path)
+
+
+def _checkpoint_key(text: Any) -> str:
+    """
+    檢查點以評論文字的雜湊為鍵：輸入檔以同名重新產生時，舊標籤不會套到別的評論上。
+    """
+    return hashlib.blake2b(str(text).encode("utf-8"), digest_size=16).hexdigest()
+
+
+def load_checkpoint(path: Path) -> Dict[str, Dict[str, str]]:
+    """
+    讀取標註檢查點（JSONL，每行 {"k": 文字雜湊, "primary": ..., "secondary": ...}）。
+    中斷時最後一行可能寫到一半：讀到不完整或格式不符（如舊版以序號為鍵）的行即停止，
+    並截斷檔案以便繼續追加。
+    """
+    labels: Dict[str, Dict[str, str]] = {}
+    if not path.exists():
+        return labels
+    valid_bytes = 0
+    with open(path, "rb") as f:
+        for line in f:
+            if not line.endswith(b"\n"):
+                break
+            try:
+                rec = _json_loads(line)
+            except json.JSONDecodeError:
+                break
+            if not isinstance(rec, dict) or "k" not in rec:
+                break
+            labels[rec["k"]] = {"primary": rec["primary"], "secondary": rec["secondary"]}
+            valid_bytes += len(line)
+    if valid_bytes < path.stat().st_size:
+        with open(path, "r+b") as f:
+            f.truncate(valid_bytes)
+    return labels
 
 
 def save_reviews(data: List[dict], path: Path) -> None:
+    if orjson is not None:
+        path.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+        return
     with open(path, "w", encoding="utf-8") as f:
         json.dump(data, f, ensure_ascii=False, indent=2)
 
@@ -515,20 +1039,30 @@ def save_reviews(data: List[dict], path: Path) -> None:
 # ==============================
 # 校驗與自動回補
 # ==============================
-def _is_valid_label(value: Any, allow: set) -> bool:
+def _is_valid_label(value: Any, allow: frozenset) -> bool:
     return isinstance(value, str) and value in allow
 
 
-def validate_reviews(reviews: List[dict]) -> Tuple[List[int], List[dict]]:
+def validate_reviews(
+    reviews: List[dict],
+    diagnostics_limit: Optional[int] = None,
+) -> Tuple[List[int], List[dict]]:
     """
-    逐一校驗 primary / secondary 是否為合法白名單。
+    以整欄成員檢查一次校驗 primary / secondary 是否為合法白名單。
     回傳：
       invalid_indices: List[int]  -> 不合法樣本在 reviews 的索引
-      diagnostics:     List[dict] -> 每筆錯誤的理由（最多取前若干筆時可印）
+      diagnostics:     List[dict] -> 錯誤理由，僅為前 diagnostics_limit 筆建立（None 表示全部）
     """
-    invalid_indices: List[int] = []
+    if not reviews:
+        return [], []
+
+    df = pd.DataFrame(reviews, columns=["primary", "secondary"])
+    valid_mask = df["primary"].isin(PRIMARY_ALLOW) & df["secondary"].isin(SECONDARY_ALLOW)
+    invalid_indices: List[int] = np.flatnonzero(~valid_mask.to_numpy()).tolist()
+
     diagnostics: List[dict] = []
-    for i, r in enumerate(reviews):
+    for i in invalid_indices[:diagnostics_limit]:
+        r = reviews[i]
         p = r.get("primary")
         s = r.get("secondary")
         errs = []
@@ -536,16 +1070,14 @@ def validate_reviews(reviews: List[dict]) -> Tuple[List[int], List[dict]]:
             errs.append(f"primary 非法: {p!r}")
         if not _is_valid_label(s, SECONDARY_ALLOW):
             errs.append(f"secondary 非法: {s!r}")
-        if errs:
-            invalid_indices.append(i)
-            text_preview = str(r.get("text", ""))[:80]
-            diagnostics.append({
-                "index": i,
-                "primary": p,
-                "secondary": s,
-                "reasons": errs,
-                "text_preview": (text_preview + ("..." if len(str(r.get("text",""))) > 80 else "")),
-            })
+        text_preview = str(r.get("text", ""))[:80]
+        diagnostics.append({
+            "index": i,
+            "primary": p,
+            "secondary": s,
+            "reasons": errs,
+            "text_preview": (text_preview + ("..." if len(str(r.get("text",""))) > 80 else "")),
+        })
     return invalid_indices, diagnostics
 
 
@@ -554,14 +1086,33 @@ def fix_dataset_loop(
     annotator: GeminiAnnotator,
     batch_size: int = BATCH_SIZE,
     max_rounds: int = VALIDATE_MAX_ROUNDS,
+    max_inflight: int = MAX_INFLIGHT,
+    checkpoint_path: Optional[Path] = None,
 ) -> List[dict]:
     """
     校驗 -> 修補 -> 迴圈直到全數合法或達到 max_rounds。
-    僅針對不合法樣本呼叫模型，其他樣本不動。
+    僅針對不合法樣本呼叫模型，其他樣本不動；各批次最多 max_inflight 個同時進行，
+    每個批次各自重試。
+    若指定 checkpoint_path，每回合結束後於背景執行緒寫出當前資料快照，
+    磁碟 I/O 與下一回合的 API 呼叫重疊進行。
     """
+    with ThreadPoolExecutor(max_workers=1) as writer:
+        return _fix_rounds(reviews, annotator, batch_size, max_rounds, max_inflight, writer, checkpoint_path)
+
+
+def _fix_rounds(
+    reviews: List[dict],
+    annotator: GeminiAnnotator,
+    batch_size: int,
+    max_rounds: int,
+    max_inflight: int,
+    writer: ThreadPoolExecutor,
+    checkpoint_path: Optional[Path],
+) -> List[dict]:
+    pending_write: Optional[Future] = None
     round_id = 1
     while round_id <= max_rounds:
-        invalid_indices, diagnostics = validate_reviews(reviews)
+        invalid_indices, diagnostics = validate_reviews(reviews, diagnostics_limit=10)
         invalid_count = len(invalid_indices)
         print(f"\n[校驗回合 {round_id}] 不合法樣本數：{invalid_count}")
 
@@ -575,27 +1126,35 @@ def fix_dataset_loop(
             print(f"    - idx={d['index']}, primary={d['primary']}, secondary={d['secondary']}, reasons={d['reasons']}")
             print(f"      text: {d['text_preview']}")
 
-        # 僅抽取不合法樣本，分批送模型重跑
-        total = invalid_count
-        for i in range(0, total, batch_size):
-            batch_positions = invalid_indices[i:i + batch_size]
-            batch = [reviews[pos] for pos in batch_positions]
-
-            # 如果 text 缺失，直接用 INVALID/GENERAL 回填，避免卡住
-            for b in batch:
-                if not b.get("text"):
-                    b["primary"] = "INVALID"
-                    b["secondary"] = "GENERAL"
-
-            labeled = annotator.annotate_batch(batch)
-            # 回填到原陣列對應位置
-            for rel_idx, pos in enumerate(batch_positions):
-                if rel_idx < len(labeled):
-                    reviews[pos]["primary"] = labeled[rel_idx].get("primary", "INVALID")
-                    reviews[pos]["secondary"] = labeled[rel_idx].get("secondary", "GENERAL")
+        # 僅抽取不合法樣本，分批並行送模型重跑
+        invalid_reviews = [reviews[pos] for pos in invalid_indices]
+
+        # 如果 text 缺失，直接用 INVALID/GENERAL 回填，避免卡住
+        for b in invalid_reviews:
+            if not b.get("text"):
+                b["primary"] = "INVALID"
+                b["secondary"] = "GENERAL"
+
+        batches = [
+            invalid_reviews[start:end]
+            for start, end in _pack_batches(invalid_reviews, max_items=batch_size)
+        ]
+        # 批次內的 dict 即 reviews 中的原物件，標註結果會就地寫回對應位置
+        asyncio.run(annotator.annotate_batches_async(batches, max_inflight=max_inflight))
+
+        if checkpoint_path is not None:
+            # 上一份快照須先寫完（並拋出其錯誤），記憶體中至多保留一份快照
+            if pending_write is not None:
+                pending_write.result()
+            # 淺拷貝每筆 dict：下一回合會就地改寫標籤，快照不受影響
+            snapshot = [dict(r) for r in reviews]
+            pending_write = writer.submit(save_reviews, snapshot, checkpoint_path)
 
         round_id += 1
 
+    if pending_write is not None:
+        pending_write.result()
+
     if round_id > max_rounds:
         print("\n⚠ 已達到最大修補回合數，資料仍可能含有不合法標籤。")
 
@@ -607,52 +1166,102 @@ def fix_dataset_loop(
 # ==============================
 def main() -> None:
     print("=== 評論數據標註工具（含校驗回補）===")
-    print(f"使用模型: {MODEL_NAME}, 批次大小: {BATCH_SIZE}")
+    print(f"使用模型: {MODEL_NAME}, 每批上限: {BATCH_SIZE} 條 / 約 {MAX_INPUT_TOKENS_PER_CALL} tokens")
 
     script_dir = Path(__file__).parent
     out_dir = (script_dir / "output")
     out_dir.mkdir(exist_ok=True, parents=True)
 
+    # 標註與校驗回補共用同一個標註器：同一組連線、速率限制與快取
+    annotator = GeminiAnnotator(API_KEY, cache_path=out_dir / LABEL_CACHE_FILENAME)
+
     # Step 1: 若有未標註檔，先執行標註
     in_file = find_latest_unlabeled_file(out_dir)
     latest_labeled_before = find_latest_labeled_file(out_dir)
 
     produced_file: Path | None = None
+    label_write: Optional[Future] = None
+    labeled_all: List[dict] = []
     if in_file:
         print(f"\n[標註] 找到未標註文件：{in_file.name}")
         reviews = load_reviews(in_file)
         print(f"[標註] 讀入 {len(reviews)} 條評論；僅處理尚未標註的樣本")
 
-        pending = [r for r in reviews if not r.get("primary")]
-        done = [r for r in reviews if r.get("primary")]
-
-        annotator = GeminiAnnotator(API_KEY)
-        labeled_all: List[dict] = list(done)
-
-        total = len(pending)
-        print(f"[標註] 未標註樣本數：{total}")
-        for i in range(0, total, BATCH_SIZE):
-            batch = pending[i:i + BATCH_SIZE]
-            print("-" * 20)
-            print(f"[標註] 批次 {i//BATCH_SIZE + 1}/{(total + BATCH_SIZE - 1)//BATCH_SIZE}（{len(batch)} 條）")
-            labeled = annotator.annotate_batch(batch)
-
-            # 預覽
-            print("  - 批次結果預覽 (前 10 筆):")
-            for item in labeled[:10]:
-                text_preview = item.get("text", "")
-                if len(text_preview) > 50:
-                    text_preview = text_preview[:50] + "..."
-                print(f"    - Text: '{text_preview}' -> P={item.get('primary')}, S={item.get('secondary')}")
-
-            labeled_all.extend(labeled)
-            time.sleep(0.3)
+        # 單次走訪分出已標註 / 待標註
+        pending: List[dict] = []
+        done: List[dict] = []
+        add_pending, add_done = pending.append, done.append
+        for r in reviews:
+            (add_done if r.get("primary") else add_pending)(r)
+
+        # 每批成功即追加到檢查點；中斷後重跑同一輸入檔會跳過已完成的樣本（以文字雜湊比對）。
+        # 標註失敗（改填預設標籤）的批次不寫入，重跑時會再送模型。
+        checkpoint_file = out_dir / f"labeling_checkpoint_{in_file.stem}.jsonl"
+        pending_labels = load_checkpoint(checkpoint_file)
+        pending_keys = [_checkpoint_key(r.get("text", "")) for r in pending]
+        todo = [i for i, k in enumerate(pending_keys) if k not in pending_labels]
+        if len(todo) < len(pending):
+            print(f"[標註] 從檢查點恢復 {len(pending) - len(todo)} 條已標註樣本：{checkpoint_file.name}")
+
+        total = len(todo)
+        print(f"[標註] 未標註樣本數：{total}（同時請求上限 {MAX_INFLIGHT}）")
+        todo_reviews = [pending[i] for i in todo]
+        spans = _pack_batches(todo_reviews)
+        batches = [todo_reviews[start:end] for start, end in spans]
+
+        with open(checkpoint_file, "ab") as ckpt:
+            finished = 0
+
+            def on_batch_done(batch_idx: int, labeled: List[dict], ok: bool) -> None:
+                nonlocal finished
+                print("-" * 20)
+                print(f"[標註] 批次 {batch_idx + 1}/{len(batches)}（{len(labeled)} 條）")
+                if ok:
+                    start, _ = spans[batch_idx]
+                    records = []
+                    for offset, item in enumerate(labeled):
+                        key = pending_keys[todo[start + offset]]
+                        label = {"primary": item.get("primary"), "secondary": item.get("secondary")}
+                        pending_labels[key] = label
+                        records.append(_json_dumpb({"k": key, **label}) + b"\n")
+                    ckpt.write(b"".join(records))
+                    ckpt.flush()
+                    finished += 1
+                    if finished % CHECKPOINT_FSYNC_EVERY == 0:
+                        os.fsync(ckpt.fileno())
+                else:
+                    print("  - 此批次未寫入檢查點，重跑時將重新標註")
+
+                # 預覽
+                print("  - 批次結果預覽 (前 10 筆):")
+                for item in labeled[:10]:
+                    text_preview = item.get("text", "")
+                    if len(text_preview) > 50:
+                        text_preview = text_preview[:50] + "..."
+                    print(f"    - Text: '{text_preview}' -> P={item.get('primary')}, S={item.get('secondary')}")
+
+            asyncio.run(annotator.annotate_batches_async(batches, on_result=on_batch_done))
+            os.fsync(ckpt.fileno())
+
+        # done 之後不再使用，直接作為輸出串列的起點（不另行複製）。
+        # 本次標註的樣本已就地寫入標籤；從檢查點恢復的樣本則由檢查點補上。
+        labeled_all = done
+        for r, key in zip(pending, pending_keys):
+            label = pending_labels.get(key)
+            if label is not None:
+                r.update(label)
+            r.setdefault("text", "")
+            labeled_all.append(r)
 
         ts = datetime.now().strftime("%Y%m%d_%H%M%S")
         out_file = out_dir / f"labeled_reviews_{ts}.json"
-        save_reviews(labeled_all, out_file)
+        # 標註檔於背景執行緒寫出，與 Step 2 的校驗/回補重疊；
+        # 寫入的是淺拷貝快照，Step 2 就地修補不會影響標註檔內容
+        label_writer = ThreadPoolExecutor(max_workers=1)
+        label_write = label_writer.submit(save_reviews, [dict(r) for r in labeled_all], out_file)
+        label_writer.shutdown(wait=False)  # 不阻塞；已送出的寫出工作仍會執行完畢
         produced_file = out_file
-        print(f"\n[標註] 完成，共 {len(labeled_all)} 條，已輸出：{out_file.name}")
+        print(f"\n[標註] 完成，共 {len(labeled_all)} 條，背景寫出：{out_file.name}")
     else:
         print("\n[標註] 沒有發現未標註檔，跳過標註步驟。")
 
@@ -664,15 +1273,22 @@ def main() -> None:
         print("\n[校驗] 找不到 labeled_reviews_*.json，略過校驗。")
         return
 
-    print(f"\n[校驗] 讀取最新生成的資料集：{target_file.name}")
-    data = load_reviews(target_file)
+    if produced_file:
+        # 剛輸出的檔案可能仍在背景寫入，直接沿用記憶體中的資料
+        print(f"\n[校驗] 使用最新生成的資料集：{target_file.name}")
+        data = labeled_all
+    else:
+        print(f"\n[校驗] 讀取最新生成的資料集：{target_file.name}")
+        data = load_reviews(target_file)
 
-    # 校驗與修補循環
-    annotator = GeminiAnnotator(API_KEY)
-    fixed = fix_dataset_loop(data, annotator, batch_size=BATCH_SIZE, max_rounds=VALIDATE_MAX_ROUNDS)
+    # 校驗與修補循環；每回合的中間結果於背景寫入修復檔
+    fixed_path = target_file.with_name(target_file.stem + "_fixed.json")
+    fixed = fix_dataset_loop(
+        data, annotator, batch_size=BATCH_SIZE, max_rounds=VALIDATE_MAX_ROUNDS, checkpoint_path=fixed_path,
+    )
 
     # 最終再做一次嚴格校驗，若仍有錯誤會告知
-    invalid_indices, diagnostics = validate_reviews(fixed)
+    invalid_indices, diagnostics = validate_reviews(fixed, diagnostics_limit=10)
     if invalid_indices:
         print(f"\n⚠ 修補後仍有 {len(invalid_indices)} 筆不合法標籤。將仍輸出修補檔供後續人工檢查。")
         print("  ├─ 錯誤示例（最多 10 筆）：")
@@ -683,9 +1299,13 @@ def main() -> None:
         print("\n✔ 修補後全部標籤均合法。")
 
     # 以「<原檔>_fixed.json」輸出
-    fixed_path = target_file.with_name(target_file.stem + "_fixed.json")
     save_reviews(fixed, fixed_path)
     print(f"\n[校驗] 修復後資料已輸出：{fixed_path.name}")
+
+    if label_write is not None:
+        # 標註檔寫完後才移除檢查點，確保中途失敗仍可續接；寫出失敗時 result() 會拋出錯誤並保留檢查點
+        label_write.result()
+        checkpoint_file.unlink()
     print("\n=== 全流程完成 ===")
 
 
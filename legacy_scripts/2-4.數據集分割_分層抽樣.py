@@ -12,11 +12,42 @@
 """
 
 import os
+import codecs
 import json
+import mmap
+import numpy as np
 import pandas as pd
-import glob
 from datetime import datetime
-from sklearn.model_selection import train_test_split
+from sklearn.model_selection import StratifiedShuffleSplit
+
+try:
+    import orjson
+except ImportError:  # 未安裝 orjson 時退回標準庫 json
+    orjson = None
+
+def _latest_file(output_dir, prefix, suffix):
+    """
+    單次掃描目錄，找出符合前綴與結尾的最新文件
+
+    Args:
+        output_dir (str): 目錄路徑
+        prefix (str): 檔名前綴
+        suffix (str): 檔名結尾
+
+    Returns:
+        str: 文件路徑，如果找不到則返回None
+    """
+    best_path = None
+    best_mtime = -1.0
+    with os.scandir(output_dir) as entries:
+        for entry in entries:
+            name = entry.name
+            if name.startswith(prefix) and name.endswith(suffix) and entry.is_file():
+                mtime = entry.stat().st_mtime
+                if mtime > best_mtime:
+                    best_mtime = mtime
+                    best_path = entry.path
+    return best_path
 
 def find_latest_dataset_file(output_dir):
     """
@@ -25,17 +56,13 @@ def find_latest_dataset_file(output_dir):
       2) labeled_reviews_*.json（回退）
     """
     try:
-        fixed_pattern = os.path.join(output_dir, "labeled_reviews_*_fixed.json")
-        fixed_files = glob.glob(fixed_pattern)
-        if fixed_files:
-            latest = max(fixed_files, key=os.path.getmtime)
+        latest = _latest_file(output_dir, "labeled_reviews_", "_fixed.json")
+        if latest:
             print(f"[OK] 找到最新的『已修復』資料集：{os.path.basename(latest)}")
             return latest
 
-        labeled_pattern = os.path.join(output_dir, "labeled_reviews_*.json")
-        labeled_files = glob.glob(labeled_pattern)
-        if labeled_files:
-            latest = max(labeled_files, key=os.path.getmtime)
+        latest = _latest_file(output_dir, "labeled_reviews_", ".json")
+        if latest:
             print(f"[OK] 未找到 *_fixed.json，回退使用：{os.path.basename(latest)}")
             return latest
 
@@ -46,21 +73,57 @@ def find_latest_dataset_file(output_dir):
         print(f"[WARN] 查找文件失敗：{e}")
         return None
 
-def save_as_json(df, file_path):
+def load_json_file(file_path):
+    """
+    讀取 JSON 文件：有 orjson 時以 mmap 映射後直接解析，不先複製成 Python 字串
+
+    Args:
+        file_path (str): 文件路徑
+
+    Returns:
+        解析後的 JSON 數據
+    """
+    if orjson is None or os.path.getsize(file_path) == 0:
+        with open(file_path, "r", encoding="utf-8-sig") as f:
+            return json.load(f)
+    with open(file_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        offset = len(codecs.BOM_UTF8) if mm[:3] == codecs.BOM_UTF8 else 0
+        with memoryview(mm)[offset:] as view:
+            return orjson.loads(view)
+
+def save_as_json(records, file_path):
     """
-    將 DataFrame 保存為指定的 JSON 格式
+    將記錄列表保存為指定的 JSON 格式（優先使用 orjson，未安裝時退回標準庫 json）
 
     Args:
-        df (pd.DataFrame): 要保存的 DataFrame
+        records (list): 要保存的列表-字典數據
         file_path (str): 文件路徑
     """
     try:
-        # 使用 to_json 并设置 orient='records' 来生成所需的列表-字典格式
-        df.to_json(file_path, orient='records', force_ascii=False, indent=2)
-        print(f"[OK] 已保存 {len(df)} 條數據到 {os.path.basename(file_path)}")
+        if orjson is not None:
+            with open(file_path, 'wb') as f:
+                f.write(orjson.dumps(records, option=orjson.OPT_INDENT_2))
+        else:
+            with open(file_path, 'w', encoding='utf-8') as f:
+                json.dump(records, f, ensure_ascii=False, indent=2)
+        print(f"[OK] 已保存 {len(records)} 條數據到 {os.path.basename(file_path)}")
     except Exception as e:
         print(f"[WARN] 保存 JSON 文件失敗：{e}")
 
+
+def label_distribution(labels):
+    """
+    以 np.unique 計算各類別的樣本數
+
+    Args:
+        labels (np.ndarray): 類別標籤陣列
+
+    Returns:
+        pd.Series: 以類別排序的樣本數
+    """
+    classes, counts = np.unique(labels, return_counts=True)
+    return pd.Series(counts, index=pd.Index(classes, name='primary'))
+
 def main():
     """主程式"""
 
@@ -83,53 +146,55 @@ def main():
         return
 
     try:
-        with open(input_file, "r", encoding="utf-8-sig") as f:
-            raw_data = json.load(f)
+        raw_data = load_json_file(input_file)
         if not isinstance(raw_data, list):
             print("[WARN] 檔案內容不是列表格式，請確認資料來源。")
             return
-        df = pd.DataFrame(raw_data)
-        print(f"[OK] 成功加載 {len(df)} 條已標註評論")
+        print(f"[OK] 成功加載 {len(raw_data)} 條已標註評論")
     except Exception as e:
         print(f"[WARN] 加載 JSON 文件失敗：{e}")
         return
 
-    if df.empty:
+    if not raw_data:
         print("[WARN] 數據為空，無法進行分割")
         return
 
-    # 檢查 'primary' 欄位是否存在
-    if 'primary' not in df.columns or df['primary'].isnull().any():
+    # 檢查 'primary' 欄位是否存在（直接取出標籤陣列，不建立整份 DataFrame）
+    primary_labels = [r.get('primary') if isinstance(r, dict) else None for r in raw_data]
+    if any(label is None for label in primary_labels):
         print("[WARN] 錯誤: 'primary' 欄位不存在或包含空值。請確保數據已完全標註。")
         return
+    labels = np.asarray(primary_labels)
 
     print()
 
     # 2. 顯示原始類別分佈
     print("2. 原始數據類別分佈:")
-    class_distribution = df['primary'].value_counts(normalize=True).sort_index()
+    class_counts = label_distribution(labels)
+    class_distribution = class_counts / len(labels)
     print(class_distribution.to_string())
     print()
     
     # 檢查是否有類別樣本過少（小於2），這會導致分層抽樣失敗
-    if (df['primary'].value_counts() < 2).any():
+    if (class_counts < 2).any():
         print("警告: 存在樣本數小於 2 的類別，這可能導致分層抽樣失敗或不穩定。")
-        print(df['primary'].value_counts())
+        print(class_counts.sort_values(ascending=False))
         print()
 
 
-    # 3. 執行分層抽樣分割 (80:20)
+    # 3. 執行分層抽樣分割 (80:20)：只對索引分層抽樣
     print("3. 執行分層抽樣 (80:20)...")
     try:
-        train_df, test_df = train_test_split(
-            df,
+        splitter = StratifiedShuffleSplit(
+            n_splits=1,
             test_size=0.2,
             random_state=42,  # 確保每次分割結果都一樣，方便重現
-            stratify=df['primary']  # 關鍵！指定依據 'primary' 欄位進行分層
         )
+        # 關鍵！依據 'primary' 標籤進行分層
+        train_idx, test_idx = next(splitter.split(np.zeros(len(labels)), labels))
         print(f"[OK] 分割完成:")
-        print(f"  - 訓練集: {len(train_df)} 條")
-        print(f"  - 測試集: {len(test_df)} 條")
+        print(f"  - 訓練集: {len(train_idx)} 條")
+        print(f"  - 測試集: {len(test_idx)} 條")
         print()
     except ValueError as e:
         print(f"[WARN] 分層抽樣失敗: {e}")
@@ -138,8 +203,8 @@ def main():
 
     # 4. 驗證分割後的類別分佈
     print("4. 驗證分割後類別分佈:")
-    train_dist = train_df['primary'].value_counts(normalize=True).sort_index()
-    test_dist = test_df['primary'].value_counts(normalize=True).sort_index()
+    train_dist = label_distribution(labels[train_idx]) / len(train_idx)
+    test_dist = label_distribution(labels[test_idx]) / len(test_idx)
     
     comparison_df = pd.DataFrame({
         'Original': class_distribution,
@@ -156,8 +221,8 @@ def main():
     train_file = os.path.join(output_dir, f"train_set_{timestamp}.json")
     test_file = os.path.join(output_dir, f"test_set_{timestamp}.json")
 
-    save_as_json(train_df, train_file)
-    save_as_json(test_df, test_file)
+    save_as_json([raw_data[i] for i in train_idx], train_file)
+    save_as_json([raw_data[i] for i in test_idx], test_file)
 
     print()
     print("=" * 60)
@@ -5,9 +5,51 @@ Apple App Store 評論爬取模組
 
 import requests
 import json
-import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import pandas as pd
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+RSS_URL = "https://itunes.apple.com/{country}/rss/customerreviews/id={app_id}/sortBy=mostRecent/page={page}/json"
+REVIEWS_PER_PAGE = 49  # 每頁 50 筆 entry，第一筆為 App 資訊，實際評論 49 條
+MAX_PAGES = 10  # RSS Feed 最多只提供 10 頁
+MAX_WORKERS = 4
+
+_SESSION = None
+
+
+def _get_session():
+    """
+    取得模組共用的 Session：連線池重用 keep-alive 連線，
+    僅在 429/5xx 時依 Retry-After 或指數退避重試，不再固定每頁等待
+    """
+    global _SESSION
+    if _SESSION is None:
+        retry = Retry(
+            total=3,
+            backoff_factor=1.0,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=("GET",),
+            respect_retry_after_header=True,
+        )
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=MAX_WORKERS, max_retries=retry)
+        session = requests.Session()
+        session.headers.update({
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+        })
+        session.mount("https://", adapter)
+        _SESSION = session
+    return _SESSION
+
+
+def _fetch_page_entries(session, app_id, country, page):
+    """抓取單頁 RSS 並回傳 entry 列表 (內部輔助函式)"""
+    url = RSS_URL.format(country=country, app_id=app_id, page=page)
+    response = session.get(url, timeout=10)
+    response.raise_for_status()
+    return response.json().get('feed', {}).get('entry', [])
+
 
 def scrape_app_store_reviews(app_id, country="tw", count=200):
     """
@@ -24,22 +66,25 @@ def scrape_app_store_reviews(app_id, country="tw", count=200):
     print(f"開始抓取 App Store 評論: {app_id}")
 
     reviews_list = []
-    page = 1
-    session = requests.Session()
-    session.headers.update({
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-    })
+    session = _get_session()
+    pages = range(1, min(MAX_PAGES, -(-count // REVIEWS_PER_PAGE)) + 1)
 
     try:
-        while len(reviews_list) < count:
-            try:
-                url = f"https://itunes.apple.com/{country}/rss/customerreviews/id={app_id}/sortBy=mostRecent/page={page}/json"
-                response = session.get(url, timeout=10)
-                response.raise_for_status()
-                data = response.json()
-
-                feed = data.get('feed', {})
-                entries = feed.get('entry', [])
+        # 所需頁面同時發出請求，再依頁碼順序處理；遇到空頁或錯誤即停止
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+            futures = [
+                executor.submit(_fetch_page_entries, session, app_id, country, page)
+                for page in pages
+            ]
+            for page, future in zip(pages, futures):
+                try:
+                    entries = future.result()
+                except requests.RequestException as e:
+                    print(f"請求錯誤 (頁面 {page}): {e}")
+                    break
+                except json.JSONDecodeError as e:
+                    print(f"JSON 解析錯誤 (頁面 {page}): {e}")
+                    break
 
                 if not entries or len(entries) <= 1:
                     break
@@ -52,15 +97,11 @@ def scrape_app_store_reviews(app_id, country="tw", count=200):
                         reviews_list.append(review)
 
                 print(f"第 {page} 頁: 獲取到 {len(entries)-1} 條評論")
-                page += 1
-                time.sleep(1)
-
-            except requests.RequestException as e:
-                print(f"請求錯誤 (頁面 {page}): {e}")
-                break
-            except json.JSONDecodeError as e:
-                print(f"JSON 解析錯誤 (頁面 {page}): {e}")
-                break
+                if len(reviews_list) >= count:
+                    break
+
+            for future in futures:
+                future.cancel()
 
         if reviews_list:
             df = pd.DataFrame(reviews_list)
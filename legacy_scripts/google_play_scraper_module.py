@@ -6,6 +6,12 @@ Google Play Store 評論爬取模組
 import pandas as pd
 from google_play_scraper import Sort, reviews
 
+# 保留的評論欄位（依輸出順序）
+REVIEW_COLUMNS = [
+    "reviewId", "userName", "score", "at", "content",
+    "replyContent", "thumbsUpCount"
+]
+
 def scrape_google_play_reviews(app_id, lang="zh_TW", country="tw", count=200):
     """
     抓取 Google Play Store 評論
@@ -30,10 +36,9 @@ def scrape_google_play_reviews(app_id, lang="zh_TW", country="tw", count=200):
             count=count
         )
 
-        df = pd.DataFrame(result, columns=[
-            "reviewId", "userName", "score", "at", "content",
-            "replyContent", "thumbsUpCount"
-        ])
+        # 先按欄位收集成 list 再建表，省去逐列 dict 轉置與欄位重排
+        data = {col: [r.get(col) for r in result] for col in REVIEW_COLUMNS}
+        df = pd.DataFrame(data, columns=REVIEW_COLUMNS)
 
         print(f"成功抓取 {len(df)} 條 Google Play 評論")
         return df
@@ -8,6 +8,28 @@ import json
 from pathlib import Path
 from dotenv import load_dotenv
 
+try:
+    import orjson
+except ImportError:  # 未安裝 orjson 時退回標準庫 json
+    orjson = None
+
+try:
+    import ijson
+except ImportError:  # 未安裝 ijson 時一律整檔解析
+    ijson = None
+
+STREAM_COUNT_THRESHOLD = 10 * 1024 * 1024  # 超過此大小（bytes）改以串流計數
+
+def count_json_items(path):
+    """計算 JSON 陣列筆數：大檔以 ijson 串流計數，其餘整檔解析"""
+    if ijson is not None and path.stat().st_size > STREAM_COUNT_THRESHOLD:
+        with open(path, 'rb') as fh:
+            return sum(1 for _ in ijson.items(fh, 'item'))
+    with open(path, 'rb') as fh:
+        raw = fh.read()
+    data = orjson.loads(raw) if orjson is not None else json.loads(raw.decode('utf-8'))
+    return len(data)
+
 def test_env():
     """測試環境變數載入"""
     # 載入環境變數
@@ -53,9 +75,7 @@ def test_files():
                     print(f"  - {f.name}")
                     # 檢查文件內容
                     try:
-                        with open(f, 'r', encoding='utf-8') as file:
-                            data = json.load(file)
-                            print(f"    包含 {len(data)} 條評論")
+                        print(f"    包含 {count_json_items(f)} 條評論")
                     except Exception as e:
                         print(f"    ✗ 讀取失敗: {e}")
         else:
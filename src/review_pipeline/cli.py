@@ -3,15 +3,33 @@ from __future__ import annotations
 
 import json
 from pathlib import Path
-from typing import Optional
+from typing import Any, Optional
 
 import click
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speed-up
+    orjson = None
+
 from .config import ProjectConfig, load_config
 from .logging_utils import setup_logging
 from .pipeline.orchestrator import ReviewPipeline
 
 
+def _echo_json(payload: Any) -> None:
+    """Print *payload* as indented JSON; non-JSON values such as paths are stringified."""
+
+    if orjson is not None:
+        # orjson already emits UTF-8; write the bytes straight to stdout without a decode/re-encode.
+        click.get_text_stream("stdout").flush()
+        stdout = click.get_binary_stream("stdout")
+        stdout.write(orjson.dumps(payload, default=str, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS) + b"\n")
+        stdout.flush()
+    else:
+        click.echo(json.dumps(payload, default=str, indent=2, ensure_ascii=False))
+
+
 def _initialise_pipeline(config_path: str) -> ReviewPipeline:
     config_file = Path(config_path).expanduser().resolve()
     config = load_config(config_file, project_root=config_file.parent.parent)
@@ -19,6 +37,15 @@ def _initialise_pipeline(config_path: str) -> ReviewPipeline:
     return ReviewPipeline(config)
 
 
+def _get_pipeline(ctx: click.Context) -> ReviewPipeline:
+    """Build the pipeline on first use so help and usage errors skip config loading."""
+
+    obj = ctx.ensure_object(dict)
+    if obj.get("pipeline") is None:
+        obj["pipeline"] = _initialise_pipeline(obj["config_path"])
+    return obj["pipeline"]
+
+
 @click.group()
 @click.option(
     "--config",
@@ -31,10 +58,9 @@ def _initialise_pipeline(config_path: str) -> ReviewPipeline:
 def cli(ctx: click.Context, config_path: str) -> None:
     """Command-line interface for the review pipeline."""
 
-    pipeline = _initialise_pipeline(config_path)
     ctx.obj = {
         "config_path": config_path,
-        "pipeline": pipeline,
+        "pipeline": None,
     }
 
 
@@ -44,9 +70,9 @@ def cli(ctx: click.Context, config_path: str) -> None:
 def crawl(ctx: click.Context, timestamp: Optional[str]) -> None:
     """Fetch reviews from configured sources."""
 
-    pipeline: ReviewPipeline = ctx.obj["pipeline"]
+    pipeline = _get_pipeline(ctx)
     outputs = pipeline.run_crawl(timestamp)
-    click.echo(json.dumps({k: str(v) if v else None for k, v in outputs.items()}, indent=2, ensure_ascii=False))
+    _echo_json({k: v or None for k, v in outputs.items()})
 
 
 @cli.command()
@@ -65,7 +91,7 @@ def merge(
     if not google_csv and not app_store_csv:
         raise click.UsageError("Provide at least one CSV input via --google-csv or --app-store-csv.")
 
-    pipeline: ReviewPipeline = ctx.obj["pipeline"]
+    pipeline = _get_pipeline(ctx)
     output = pipeline.run_merge(
         Path(google_csv) if google_csv else None,
         Path(app_store_csv) if app_store_csv else None,
@@ -81,7 +107,7 @@ def merge(
 def prepare_labeling(ctx: click.Context, merged_csv: str, timestamp: Optional[str]) -> None:
     """Create a cleaned unlabeled dataset ready for annotation."""
 
-    pipeline: ReviewPipeline = ctx.obj["pipeline"]
+    pipeline = _get_pipeline(ctx)
     output = pipeline.prepare_labeling(Path(merged_csv), timestamp)
     click.echo(str(output))
 
@@ -99,9 +125,9 @@ def label(
 ) -> None:
     """Run the configured labeler and optional validation/fixing."""
 
-    pipeline: ReviewPipeline = ctx.obj["pipeline"]
+    pipeline = _get_pipeline(ctx)
     results = pipeline.run_labeling(Path(unlabeled_json), timestamp, run_validation=not skip_validation)
-    click.echo(json.dumps({k: str(v) if v else None for k, v in results.items()}, indent=2, ensure_ascii=False))
+    _echo_json({k: v or None for k, v in results.items()})
 
 
 @cli.command()
@@ -111,9 +137,9 @@ def label(
 def split(ctx: click.Context, labeled_json: str, timestamp: Optional[str]) -> None:
     """Split labeled dataset into train/test partitions."""
 
-    pipeline: ReviewPipeline = ctx.obj["pipeline"]
+    pipeline = _get_pipeline(ctx)
     results = pipeline.run_split(Path(labeled_json), timestamp)
-    click.echo(json.dumps({k: str(v) for k, v in results.items()}, indent=2, ensure_ascii=False))
+    _echo_json(results)
 
 
 @cli.command(name="run-all")
@@ -121,6 +147,6 @@ def split(ctx: click.Context, labeled_json: str, timestamp: Optional[str]) -> No
 def run_all(ctx: click.Context) -> None:
     """Execute the full end-to-end pipeline."""
 
-    pipeline: ReviewPipeline = ctx.obj["pipeline"]
+    pipeline = _get_pipeline(ctx)
     results = pipeline.run_all()
-    click.echo(json.dumps({k: str(v) for k, v in results.items()}, indent=2, ensure_ascii=False))
+    _echo_json(results)
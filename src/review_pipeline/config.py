@@ -1,10 +1,25 @@
 from __future__ import annotations
 
+import os
+import threading
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
 
 import yaml
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, Field, field_validator
+
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:  # pragma: no cover - PyYAML built without libyaml
+    from yaml import SafeLoader as _YamlLoader
+
+
+def _absolute(path: Path, project_root: Path) -> Path:
+    """Anchor *path* at *project_root* if relative and normalise it without touching the filesystem."""
+
+    if not path.is_absolute():
+        path = project_root / path
+    return Path(os.path.abspath(path))
 
 
 class PathsConfig(BaseModel):
@@ -18,17 +33,33 @@ class PathsConfig(BaseModel):
     logs_dir: Path = Field(default=Path("logs"))
 
     def resolve(self, project_root: Path) -> "PathsConfig":
-        """Return a copy with paths resolved relative to *project_root*."""
+        """Return a copy with paths made absolute relative to *project_root*.
+
+        Paths are normalised lexically (no symlink walk), and no directories are
+        created here; call :meth:`ensure_dirs` for that.
+        """
 
         resolved = {}
-        for field_name, value in self.dict().items():
-            path = Path(value)
-            if not path.is_absolute():
-                path = (project_root / path).resolve()
-            path.mkdir(parents=True, exist_ok=True)
-            resolved[field_name] = path
+        for field_name, value in self.model_dump().items():
+            resolved[field_name] = _absolute(Path(value), project_root)
         return PathsConfig(**resolved)
 
+    def ensure_dirs(self, *extra: Path) -> None:
+        """Create every configured directory (plus *extra*), deepest first.
+
+        Directories already created as a parent of a deeper one are skipped.
+        """
+
+        targets = {Path(value) for value in self.model_dump().values()}
+        targets.update(Path(path) for path in extra)
+        created: set = set()
+        for path in sorted(targets, key=lambda p: len(p.parts), reverse=True):
+            if path in created:
+                continue
+            path.mkdir(parents=True, exist_ok=True)
+            created.add(path)
+            created.update(path.parents)
+
 
 class GooglePlayCrawlerConfig(BaseModel):
     enabled: bool = Field(default=True)
@@ -45,6 +76,8 @@ class AppStoreCrawlerConfig(BaseModel):
     review_count: int = Field(default=200, ge=1)
     request_delay: float = Field(default=1.0, ge=0.0)
     max_pages: Optional[int] = Field(default=None, ge=1)
+    max_workers: int = Field(default=4, ge=1)
+    cache_ttl_sec: float = Field(default=300.0, ge=0.0)
 
 
 class ScrapingConfig(BaseModel):
@@ -61,22 +94,29 @@ class CleaningConfig(BaseModel):
     min_length: int = Field(default=1, ge=0)
     min_chinese_chars: int = Field(default=2, ge=0)
     enable_emoji_removal: bool = Field(default=True)
+    n_jobs: Optional[int] = Field(default=None, ge=1)
 
 
 class GeminiConfig(BaseModel):
     api_key_env: str = Field(default="GEMINI_API_KEY")
     model: str = Field(default="gemini-2.5-flash")
     batch_size: int = Field(default=100, ge=1)
+    concurrency: int = Field(default=4, ge=1)
+    max_output_tokens: int = Field(default=60000, ge=1)
+    requests_per_minute: Optional[int] = Field(default=None, ge=1)
+    tokens_per_minute: Optional[int] = Field(default=None, ge=1)
     max_retries: int = Field(default=5, ge=0)
     retry_delay_sec: float = Field(default=30.0, ge=0.0)
     validate_max_rounds: int = Field(default=8, ge=1)
+    cache_file: Optional[str] = Field(default=None)
 
 
 class LabelingConfig(BaseModel):
     provider: str = Field(default="gemini")
     gemini: GeminiConfig = Field(default_factory=GeminiConfig)
 
-    @validator("provider")
+    @field_validator("provider")
+    @classmethod
     def validate_provider(cls, value: str) -> str:
         allowed = {"gemini"}
         if value not in allowed:
@@ -108,36 +148,70 @@ class ProjectConfig(BaseModel):
     def resolved(self, project_root: Path) -> "ProjectConfig":
         resolved_paths = self.paths.resolve(project_root)
 
-        logging_file = Path(self.logging.file)
-        if not logging_file.is_absolute():
-            logging_file = (project_root / logging_file).resolve()
-        logging_file.parent.mkdir(parents=True, exist_ok=True)
+        logging_file = _absolute(Path(self.logging.file), project_root)
+        labeling_config = self.labeling
+        cache_file = labeling_config.gemini.cache_file
+        if cache_file:
+            cache_path = _absolute(Path(cache_file), project_root)
+            gemini_config = labeling_config.gemini.model_copy(update={"cache_file": str(cache_path)})
+            labeling_config = labeling_config.model_copy(update={"gemini": gemini_config})
 
-        logging_config = self.logging.copy(update={"file": str(logging_file)})
+        logging_config = self.logging.model_copy(update={"file": str(logging_file)})
 
-        return ProjectConfig(
+        config = ProjectConfig(
             paths=resolved_paths,
             scraping=self.scraping,
             merging=self.merging,
             cleaning=self.cleaning,
-            labeling=self.labeling,
+            labeling=labeling_config,
             splitting=self.splitting,
             logging=logging_config,
         )
+        config.ensure_dirs()
+        return config
+
+    def ensure_dirs(self) -> None:
+        """Create the configured directories and those holding the log and label cache files."""
+
+        extra_dirs = [Path(self.logging.file).parent]
+        if self.labeling.gemini.cache_file:
+            extra_dirs.append(Path(self.labeling.gemini.cache_file).parent)
+        self.paths.ensure_dirs(*extra_dirs)
+
+
+# Newest parsed config per (config path, project root), tagged with the file's mtime.
+_config_cache: Dict[Tuple[Path, Path], Tuple[int, ProjectConfig]] = {}
+_config_cache_lock = threading.Lock()
 
 
 def load_config(config_path: Path, project_root: Optional[Path] = None) -> ProjectConfig:
-    """Load the YAML *config_path* into a :class:`ProjectConfig`."""
+    """Load the YAML *config_path* into a :class:`ProjectConfig`.
+
+    The parsed result is memoised per resolved path and project root until the
+    file's modification time changes, so repeated loads of an unchanged file skip
+    parsing and path resolution. Every call still (re)creates the configured
+    directories and returns its own deep copy, so callers may mutate it freely.
+    """
 
     config_path = config_path.resolve()
     if project_root is None:
         project_root = config_path.parent.parent if config_path.is_absolute() else Path.cwd()
 
-    if not config_path.exists():
-        raise FileNotFoundError(f"Configuration file not found: {config_path}")
-
-    with config_path.open("r", encoding="utf-8") as handle:
-        data: Dict[str, Any] = yaml.safe_load(handle) or {}
-
-    config = ProjectConfig(**data)
-    return config.resolved(project_root)
+    try:
+        mtime_ns = config_path.stat().st_mtime_ns
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Configuration file not found: {config_path}") from None
+
+    key = (config_path, Path(os.path.abspath(project_root)))
+    with _config_cache_lock:
+        cached = _config_cache.get(key)
+        if cached is not None and cached[0] == mtime_ns:
+            config = cached[1]
+            config.ensure_dirs()
+        else:
+            with config_path.open("r", encoding="utf-8") as handle:
+                data: Dict[str, Any] = yaml.load(handle, Loader=_YamlLoader) or {}
+
+            config = ProjectConfig.model_validate(data).resolved(project_root)
+            _config_cache[key] = (mtime_ns, config)
+        return config.model_copy(deep=True)
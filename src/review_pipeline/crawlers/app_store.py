@@ -1,18 +1,74 @@
 
 from __future__ import annotations
 
+import json
 import logging
+import threading
 import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from datetime import datetime
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Tuple
 
 import pandas as pd
 import requests
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speed-up
+    orjson = None
+
 from ..config import AppStoreCrawlerConfig
 from .base import BaseCrawler
 
+REVIEWS_PER_PAGE = 50
+COLUMNS = ("reviewId", "userName", "rating", "date", "title", "review", "isEdited")
+
+# Raw RSS page bodies keyed by URL: (fetched_at, content). Least recently used pages are
+# evicted once more than PAGE_CACHE_MAX_ENTRIES are held.
+PAGE_CACHE_MAX_ENTRIES = 64
+_page_cache: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+_page_cache_lock = threading.Lock()
+
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+def _get_session() -> requests.Session:
+    """Return the module-wide session so keep-alive connections survive across crawls."""
+
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            session.headers.update({
+                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+            })
+            _session = session
+        return _session
+
+
+def _cached_page(url: str, ttl: float) -> Optional[bytes]:
+    with _page_cache_lock:
+        hit = _page_cache.get(url)
+        if hit is None:
+            return None
+        fetched_at, content = hit
+        if time.monotonic() - fetched_at > ttl:
+            del _page_cache[url]
+            return None
+        _page_cache.move_to_end(url)
+        return content
+
+
+def _store_page(url: str, content: bytes) -> None:
+    with _page_cache_lock:
+        _page_cache[url] = (time.monotonic(), content)
+        _page_cache.move_to_end(url)
+        while len(_page_cache) > PAGE_CACHE_MAX_ENTRIES:
+            _page_cache.popitem(last=False)
+
 
 @dataclass
 class AppStoreCrawler(BaseCrawler):
@@ -26,84 +82,121 @@ class AppStoreCrawler(BaseCrawler):
             self.logger.info("App Store crawler disabled; skipping fetch.")
             return pd.DataFrame()
 
-        session = requests.Session()
-        session.headers.update({
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-        })
+        session = _get_session()
 
-        reviews_data = []
+        reviews_data: List[Tuple[object, ...]] = []
         page = 1
+        country = self.config.country
+        app_id = self.config.app_id
+        review_count = self.config.review_count
         max_pages = self.config.max_pages
+        workers = self.config.max_workers
+        delay = self.config.request_delay
+        base_url = f"https://itunes.apple.com/{country}/rss/customerreviews/id={app_id}/sortBy=mostRecent/page="
         self.logger.info(
             "Fetching App Store reviews app_id=%s country=%s count=%s",
-            self.config.app_id,
-            self.config.country,
-            self.config.review_count,
+            app_id,
+            country,
+            review_count,
         )
 
-        try:
-            while len(reviews_data) < self.config.review_count:
-                if max_pages is not None and page > max_pages:
-                    self.logger.info("Reached configured max_pages=%s", max_pages)
-                    break
-
-                url = (
-                    f"https://itunes.apple.com/{self.config.country}/rss/customerreviews/"
-                    f"id={self.config.app_id}/sortBy=mostRecent/page={page}/json"
-                )
-
-                try:
-                    response = session.get(url, timeout=15)
-                    response.raise_for_status()
-                    data = response.json()
-                except (requests.RequestException, ValueError) as exc:
-                    self.logger.error("App Store request failed on page %s: %s", page, exc)
-                    break
-
-                entries = data.get("feed", {}).get("entry", [])
-                if len(entries) <= 1:
-                    self.logger.info("No more App Store reviews after page %s", page)
-                    break
-
-                for entry in entries[1:]:
-                    review = self._parse_entry(entry)
-                    if review:
-                        reviews_data.append(review)
-                        if len(reviews_data) >= self.config.review_count:
-                            break
-
-                self.logger.debug("Fetched %s entries from page %s", len(entries) - 1, page)
-                page += 1
-                time.sleep(self.config.request_delay)
-
-        finally:
-            session.close()
-
-        df = pd.DataFrame(reviews_data)
+        # Pages are requested in waves of up to ``max_workers`` concurrent requests,
+        # sized to what is still missing, and consumed in page order. Wave starts are
+        # spaced at least ``request_delay`` apart; time spent fetching counts toward it.
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            finished = False
+            last_wave = 0.0
+            while not finished and len(reviews_data) < review_count:
+                missing = review_count - len(reviews_data)
+                wave = min(workers, -(-missing // REVIEWS_PER_PAGE))
+                if max_pages is not None:
+                    wave = min(wave, max_pages - page + 1)
+                    if wave <= 0:
+                        self.logger.info("Reached configured max_pages=%s", max_pages)
+                        break
+
+                wait = delay - (time.monotonic() - last_wave)
+                if wait > 0:
+                    time.sleep(wait)
+                last_wave = time.monotonic()
+
+                pages = range(page, page + wave)
+                futures = [
+                    executor.submit(self._fetch_page, session, base_url + str(p) + "/json", p)
+                    for p in pages
+                ]
+                for current, future in zip(pages, futures):
+                    try:
+                        data = future.result()
+                    except (requests.RequestException, ValueError) as exc:
+                        self.logger.error("App Store request failed on page %s: %s", current, exc)
+                        finished = True
+                        break
+
+                    entries = data.get("feed", {}).get("entry", [])
+                    if len(entries) <= 1:
+                        self.logger.info("No more App Store reviews after page %s", current)
+                        finished = True
+                        break
+
+                    for entry in entries[1:]:
+                        review = self._parse_entry(entry)
+                        if review:
+                            reviews_data.append(review)
+                            if len(reviews_data) >= review_count:
+                                break
+
+                    self.logger.debug("Fetched %s entries from page %s", len(entries) - 1, current)
+                    if len(reviews_data) >= review_count:
+                        finished = True
+                        break
+
+                if finished:
+                    for future in futures:
+                        future.cancel()
+                else:
+                    page += wave
+
+        df = pd.DataFrame.from_records(reviews_data, columns=COLUMNS)
+        # Feed timestamps carry a UTC offset (e.g. ``2024-01-01T00:00:00-07:00``); keep the
+        # local wall-clock time, converting the whole column at once. Entries whose timestamp
+        # does not parse are skipped, as a malformed entry is.
+        dates = pd.to_datetime(df["date"].str.slice(0, 19), format="%Y-%m-%dT%H:%M:%S", errors="coerce")
+        valid = dates.notna()
+        if not valid.all():
+            self.logger.debug("Skipping %s App Store entries with an unparseable date", int((~valid).sum()))
+            df = df.loc[valid].reset_index(drop=True)
+            dates = dates[valid].reset_index(drop=True)
+        df["date"] = dates.dt.strftime("%Y-%m-%d %H:%M:%S")
         self.logger.info("Fetched %s App Store reviews", len(df))
         return df
 
-    def _parse_entry(self, entry: Dict[str, object]) -> Optional[Dict[str, object]]:
+    def _fetch_page(self, session: requests.Session, url: str, page: int) -> Dict[str, object]:
+        ttl = self.config.cache_ttl_sec
+        content = _cached_page(url, ttl) if ttl > 0 else None
+        if content is None:
+            response = session.get(url, timeout=15)
+            response.raise_for_status()
+            content = response.content
+            if ttl > 0:
+                _store_page(url, content)
+        else:
+            self.logger.debug("Using cached App Store page %s", page)
+        return orjson.loads(content) if orjson is not None else json.loads(content)
+
+    def _parse_entry(self, entry: Dict[str, object]) -> Optional[Tuple[object, ...]]:
+        """Return one review as a tuple ordered like :data:`COLUMNS`."""
+
         try:
-            author_name = (
-                entry.get("author", {}).get("name", {}).get("label", "Unknown")
+            return (
+                entry.get("id", {}).get("label", ""),
+                entry.get("author", {}).get("name", {}).get("label", "Unknown"),
+                int(entry.get("im:rating", {}).get("label", "0")),
+                entry.get("updated", {}).get("label", ""),
+                entry.get("title", {}).get("label", ""),
+                entry.get("content", {}).get("label", ""),
+                False,
             )
-            content = entry.get("content", {}).get("label", "")
-            rating = int(entry.get("im:rating", {}).get("label", "0"))
-            title = entry.get("title", {}).get("label", "")
-            review_id = entry.get("id", {}).get("label", "")
-            updated = entry.get("updated", {}).get("label", "")
-            review_date = datetime.fromisoformat(updated.replace("Z", "+00:00"))
-
-            return {
-                "reviewId": review_id,
-                "userName": author_name,
-                "rating": rating,
-                "date": review_date.strftime("%Y-%m-%d %H:%M:%S"),
-                "title": title,
-                "review": content,
-                "isEdited": False,
-            }
-        except Exception as exc:  # pragma: no cover - defensive
+        except (AttributeError, TypeError, ValueError) as exc:  # pragma: no cover - defensive
             self.logger.debug("Failed to parse App Store entry: %s", exc)
             return None
@@ -43,19 +43,20 @@ class GooglePlayCrawler(BaseCrawler):
             self.logger.error("Failed to fetch Google Play reviews: %s", exc)
             return pd.DataFrame()
 
-        df = pd.DataFrame(raw_reviews)
+        # Build column lists first so pandas assigns columns instead of transposing row dicts.
+        columns = list(raw_reviews[0]) if raw_reviews else []
+        df = pd.DataFrame({col: [r.get(col) for r in raw_reviews] for col in columns})
         if df.empty:
             self.logger.warning("No Google Play reviews returned.")
             return df
 
-        column_map = {
+        # Relabel in place of copying: downstream only reads the renamed columns
+        # (the merger maps ``review`` back to ``content``).
+        df = df.rename(columns={
             "score": "rating",
             "at": "date",
             "content": "review",
-        }
-        for source, target in column_map.items():
-            if source in df.columns:
-                df[target] = df[source]
+        })
 
         if "date" in df.columns:
             df["date"] = pd.to_datetime(df["date"], errors="coerce").dt.strftime("%Y-%m-%d %H:%M:%S")
@@ -1,6 +1,7 @@
 
 from __future__ import annotations
 
+import asyncio
 from abc import ABC, abstractmethod
 from typing import Iterable, List, Sequence
 
@@ -12,6 +13,14 @@ class BaseLabeler(ABC):
     def annotate(self, records: Sequence[dict]) -> List[dict]:
         """Return labeled copies of *records*."""
 
+    async def annotate_async(self, records: Sequence[dict]) -> List[dict]:
+        """Coroutine form of :meth:`annotate`; by default runs it in a worker thread."""
+
+        return await asyncio.to_thread(self.annotate, records)
+
+    async def aclose(self) -> None:
+        """Release resources bound to the running event loop; call before the loop ends."""
+
     @abstractmethod
     def validate(self, records: Sequence[dict]) -> List[dict]:
         """Return diagnostics for invalid records (empty if all valid)."""
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, List, Sequence, Tuple
+
+
+class LabelCache:
+    """Content-addressed label store backed by SQLite.
+
+    Keys are opaque digests supplied by the caller; they should cover everything
+    that influences a label (review text, model, instructions) so stale entries
+    are never reused after a configuration change.
+    """
+
+    _QUERY_CHUNK = 500  # stay well below SQLite's bound-parameter limit
+
+    def __init__(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS labels ("
+            "key TEXT PRIMARY KEY, primary_label TEXT NOT NULL, secondary_label TEXT NOT NULL)"
+        )
+        self._conn.commit()
+        self._lock = threading.Lock()
+
+    def get_many(self, keys: Sequence[str]) -> Dict[str, Dict[str, str]]:
+        found: Dict[str, Dict[str, str]] = {}
+        with self._lock:
+            for start in range(0, len(keys), self._QUERY_CHUNK):
+                chunk = list(keys[start : start + self._QUERY_CHUNK])
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT key, primary_label, secondary_label FROM labels WHERE key IN ({placeholders})",
+                    chunk,
+                )
+                for key, primary, secondary in rows:
+                    found[key] = {"primary": primary, "secondary": secondary}
+        return found
+
+    def put_many(self, items: List[Tuple[str, Dict[str, str]]]) -> None:
+        if not items:
+            return
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO labels VALUES (?, ?, ?)",
+                [(key, label["primary"], label["secondary"]) for key, label in items],
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
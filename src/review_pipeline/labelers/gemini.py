@@ -1,22 +1,43 @@
 
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import importlib.util
 import json
 import logging
 import os
+import re
+import sys
 import time
 from dataclasses import dataclass
 from enum import Enum
-from typing import Any, Dict, List, Sequence, Tuple
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
+import httpx
 from dotenv import load_dotenv
 from textwrap import dedent
 from google import genai
+from google.genai import errors as genai_errors
 from google.genai import types
 from pydantic import BaseModel
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speed-up
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:  # pragma: no cover - optional speed-up
+    msgspec = None
+
 from ..config import GeminiConfig
 from .base import BaseLabeler
+from .cache import LabelCache
+from .rate_limit import TokenBucket
 
 
 class PrimaryCategory(str, Enum):
@@ -80,12 +101,64 @@ SECONDARY_MAP = {
     "NOTIFICATION": "GENERAL",
 }
 
+# Allowed values map to themselves, synonyms to their canonical value: one lookup normalises a label.
+# Canonical values are interned, so every labelled record shares one string object per label.
+PRIMARY_NORMALIZE = {
+    key: sys.intern(value) for key, value in {**{v: v for v in PRIMARY_ALLOW}, **PRIMARY_MAP}.items()
+}
+SECONDARY_NORMALIZE = {
+    key: sys.intern(value) for key, value in {**{v: v for v in SECONDARY_ALLOW}, **SECONDARY_MAP}.items()
+}
+
+_INVALID = sys.intern("INVALID")
+_GENERAL = sys.intern("GENERAL")
+
+LABEL_RULES: Dict[str, Tuple[Dict[str, str], str]] = {
+    "primary": (PRIMARY_NORMALIZE, _INVALID),
+    "secondary": (SECONDARY_NORMALIZE, _GENERAL),
+}
+
+# Rough output cost of one {"primary": ..., "secondary": ...} object, and the share of
+# max_output_tokens a batch may plan to use before truncation becomes likely.
+OUTPUT_TOKENS_PER_LABEL = 15
+OUTPUT_TOKEN_HEADROOM = 0.8
+
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+# Backoff for HTTP 429: retry_delay_sec doubled per attempt, capped at this many seconds.
+RATE_LIMIT_MAX_DELAY_SEC = 300.0
+
+# Opening fence line, then an optional body, then any number of closing fence lines; group 1
+# is None for an empty body. Line breaks may be \n, \r\n or \r, as str.splitlines accepts.
+CODE_FENCE_RE = re.compile(
+    r"^```[^\r\n]*(?:(?:\r\n?|\n)(.*?))??(?:(?:\r\n?|\n)[^\S\r\n]*```[^\r\n]*)*$", re.DOTALL
+)
+
+
+@lru_cache(maxsize=1024)
+def _normalize_label(value: str, kind: str) -> str:
+    mapping, fallback = LABEL_RULES[kind]
+    return mapping.get(value.strip().upper().replace(" ", "_"), fallback)
+
 
 class LabelPair(BaseModel):
     primary: PrimaryCategory
     secondary: SecondaryCategory
 
 
+if msgspec is not None:
+
+    class _LabelStruct(msgspec.Struct):
+        """Decode-only twin of :class:`LabelPair` for the raw-text response path."""
+
+        primary: str
+        secondary: str
+
+    _LABEL_LIST_DECODER = msgspec.json.Decoder(List[_LabelStruct])
+else:  # pragma: no cover - msgspec not installed
+    _LABEL_LIST_DECODER = None
+
+
 @dataclass
 class GeminiLabeler(BaseLabeler):
     config: GeminiConfig
@@ -99,7 +172,10 @@ class GeminiLabeler(BaseLabeler):
                 f"Environment variable {self.config.api_key_env} is not set; cannot initialise Gemini labeler."
             )
 
-        self.client = genai.Client(api_key=api_key)
+        self._api_key = api_key
+        self.client = self._build_client()
+        # Event loop the client's async pool is bound to; see annotate_async().
+        self._client_loop: Optional[asyncio.AbstractEventLoop] = None
         self.system_instruction = dedent("""
             You classify mobile-banking user reviews using TWO orthogonal labels.
             Output strictly as a JSON array of objects, each with ONLY these keys:
@@ -118,7 +194,7 @@ class GeminiLabeler(BaseLabeler):
             system_instruction=self.system_instruction,
             temperature=0.1,
             top_p=0.9,
-            max_output_tokens=60000,
+            max_output_tokens=self.config.max_output_tokens,
             response_mime_type="application/json",
             response_schema=list[LabelPair],
             safety_settings=[
@@ -141,63 +217,78 @@ class GeminiLabeler(BaseLabeler):
             ],
         )
 
+        # Cache keys cover the model and instructions so a prompt change never reuses stale labels.
+        self.cache = LabelCache(Path(self.config.cache_file)) if self.config.cache_file else None
+        instruction_digest = hashlib.blake2b(self.system_instruction.encode("utf-8"), digest_size=8).hexdigest()
+        self._cache_prefix = f"{self.config.model}|{instruction_digest}|"
+
+        # Largest batch whose labels fit the output budget; bigger batches get truncated replies.
+        self.max_batch_size = max(
+            1, int(self.config.max_output_tokens * OUTPUT_TOKEN_HEADROOM) // OUTPUT_TOKENS_PER_LABEL
+        )
+        # Client-side pacing so concurrent batches stay under the provider's RPM/TPM quotas.
+        self.request_bucket = (
+            TokenBucket(self.config.requests_per_minute) if self.config.requests_per_minute else None
+        )
+        self.token_bucket = TokenBucket(self.config.tokens_per_minute) if self.config.tokens_per_minute else None
+
+        if self.config.batch_size > self.max_batch_size:
+            self.logger.warning(
+                "batch_size %s exceeds the output token budget; using %s.", self.config.batch_size, self.max_batch_size
+            )
+
     # ------------------------------------------------------------------
     # Public API
     # ------------------------------------------------------------------
     def annotate(self, records: Sequence[dict]) -> List[dict]:
-        labelled: List[dict] = []
-        for start in range(0, len(records), self.config.batch_size):
-            batch = list(records[start : start + self.config.batch_size])
-            result = self.annotate_batch(batch)
-            labelled.extend(result)
-            time.sleep(0.3)
-        return labelled
+        """Label *records*, running up to ``config.concurrency`` batches at once."""
+
+        return asyncio.run(self._annotate_and_close(records))
+
+    async def aclose(self) -> None:
+        # asyncio.run() closes its loop on return, so the async pool is released while the
+        # loop is still alive; the next annotate_async() then builds a fresh client.
+        if self._client_loop is not None:
+            await self.client.aio.aclose()
+
+    async def annotate_async(self, records: Sequence[dict]) -> List[dict]:
+        """Coroutine form of :meth:`annotate`.
+
+        Callers making several passes should await this from one event loop so the
+        async connection pool is reused; on a different loop the client is rebuilt,
+        because httpx pools cannot outlive the loop they were first used on.
+        """
+
+        loop = asyncio.get_running_loop()
+        if self._client_loop is not None and self._client_loop is not loop:
+            self.client = self._build_client()
+        self._client_loop = loop
+        return await self._annotate_async(records)
+
+    async def _annotate_and_close(self, records: Sequence[dict]) -> List[dict]:
+        try:
+            return await self.annotate_async(records)
+        finally:
+            await self.aclose()
 
     def annotate_batch(self, records: Sequence[dict]) -> List[dict]:
         texts = [str(r.get("text", "")) for r in records]
         attempt = 0
+        error: Exception | None = None
         while attempt <= self.config.max_retries:
             try:
                 raw = self._call_model_once(texts)
                 if raw:
-                    labelled = self._post_sanitise(raw)
-                    merged: List[dict] = []
-                    limit = min(len(labelled), len(records))
-                    for idx in range(limit):
-                        merged.append(
-                            {
-                                **records[idx],
-                                "text": records[idx].get("text", ""),
-                                "primary": labelled[idx].get("primary", "INVALID"),
-                                "secondary": labelled[idx].get("secondary", "GENERAL"),
-                            }
-                        )
-                    for idx in range(limit, len(records)):
-                        merged.append(
-                            {
-                                **records[idx],
-                                "text": records[idx].get("text", ""),
-                                "primary": "INVALID",
-                                "secondary": "GENERAL",
-                            }
-                        )
-                    return merged
+                    return self._merge_labels(records, raw)
+                error = None
             except Exception as exc:  # pragma: no cover - network errors
-                self.logger.warning(
-                    "Gemini annotate attempt %s/%s failed: %s",
-                    attempt + 1,
-                    self.config.max_retries + 1,
-                    exc,
-                )
+                self._log_attempt_failure(attempt, exc)
+                error = exc
             attempt += 1
             if attempt <= self.config.max_retries:
-                time.sleep(self.config.retry_delay_sec)
+                time.sleep(self._retry_delay(attempt, error))
 
-        self.logger.error("Gemini annotate failed; returning INVALID placeholders.")
-        return [
-            {**record, "primary": "INVALID", "secondary": "GENERAL", "text": record.get("text", "")}
-            for record in records
-        ]
+        return self._placeholder_labels(records)
 
     def validate(self, records: Sequence[dict]) -> List[dict]:
         invalid: List[dict] = []
@@ -227,23 +318,204 @@ class GeminiLabeler(BaseLabeler):
     # ------------------------------------------------------------------
     # Internal helpers
     # ------------------------------------------------------------------
-    def _call_model_once(self, texts: Sequence[str]) -> List[dict]:
+    def _build_client(self) -> genai.Client:
+        # The SDK keeps one sync and one async httpx client per genai.Client; size the pools
+        # for the configured concurrency and negotiate HTTP/2 (one multiplexed connection)
+        # when the h2 package is present.
+        pool_args: Dict[str, Any] = {
+            "limits": httpx.Limits(
+                max_connections=self.config.concurrency * 2,
+                max_keepalive_connections=self.config.concurrency,
+            ),
+        }
+        if HTTP2_AVAILABLE:
+            pool_args["http2"] = True
+        return genai.Client(
+            api_key=self._api_key,
+            http_options=types.HttpOptions(client_args=pool_args, async_client_args=pool_args),
+        )
+
+    async def _annotate_async(self, records: Sequence[dict]) -> List[dict]:
+        batch_size = min(self.config.batch_size, self.max_batch_size)
+        batches = [list(records[start : start + batch_size]) for start in range(0, len(records), batch_size)]
+        results: List[List[dict]] = [[] for _ in batches]
+        # Created per run: a semaphore is bound to the event loop it is first used on.
+        semaphore = asyncio.Semaphore(self.config.concurrency)
+
+        async def bounded(index: int, batch: List[dict]) -> Tuple[int, List[dict]]:
+            async with semaphore:
+                return index, await self._annotate_batch_async(batch)
+
+        tasks = [asyncio.create_task(bounded(i, batch)) for i, batch in enumerate(batches)]
+        for finished, task in enumerate(asyncio.as_completed(tasks), start=1):
+            index, labelled = await task
+            results[index] = labelled
+            self.logger.debug("Gemini batch %s/%s labelled (%s records)", finished, len(batches), len(labelled))
+
+        return [record for batch in results for record in batch]
+
+    async def _annotate_batch_async(self, records: Sequence[dict]) -> List[dict]:
+        texts = [str(r.get("text", "")) for r in records]
+        attempt = 0
+        error: Exception | None = None
+        while attempt <= self.config.max_retries:
+            try:
+                raw = await self._call_model_once_async(texts)
+                if raw:
+                    return self._merge_labels(records, raw)
+                error = None
+            except Exception as exc:  # pragma: no cover - network errors
+                self._log_attempt_failure(attempt, exc)
+                error = exc
+            attempt += 1
+            if attempt <= self.config.max_retries:
+                await asyncio.sleep(self._retry_delay(attempt, error))
+
+        return self._placeholder_labels(records)
+
+    def _merge_labels(self, records: Sequence[dict], raw: List[dict]) -> List[dict]:
+        labelled = self._post_sanitise(raw)
+        missing = len(records) - len(labelled)
+        if missing > 0:
+            labelled += [{"primary": _INVALID, "secondary": _GENERAL}] * missing
+        return [
+            {**record, "text": record["text"] if "text" in record else "", **labels}
+            for record, labels in zip(records, labelled)
+        ]
+
+    def _placeholder_labels(self, records: Sequence[dict]) -> List[dict]:
+        self.logger.error("Gemini annotate failed; returning INVALID placeholders.")
+        return [
+            {**record, "primary": _INVALID, "secondary": _GENERAL, "text": record.get("text", "")}
+            for record in records
+        ]
+
+    def _retry_delay(self, attempt: int, error: Exception | None) -> float:
+        """Fixed delay between attempts, backing off exponentially while Gemini answers 429."""
+
+        if isinstance(error, genai_errors.APIError) and error.code == 429:
+            return min(self.config.retry_delay_sec * 2 ** (attempt - 1), RATE_LIMIT_MAX_DELAY_SEC)
+        return self.config.retry_delay_sec
+
+    def _estimate_tokens(self, texts: Sequence[str]) -> int:
+        # CJK review text runs close to one token per character; add the expected label output.
+        return sum(len(text) for text in texts) + OUTPUT_TOKENS_PER_LABEL * len(texts)
+
+    def _log_attempt_failure(self, attempt: int, exc: Exception) -> None:
+        self.logger.warning(
+            "Gemini annotate attempt %s/%s failed: %s",
+            attempt + 1,
+            self.config.max_retries + 1,
+            exc,
+        )
+
+    @staticmethod
+    def _build_prompt(texts: Sequence[str]) -> str:
         payload = {"reviews": [{"text": t} for t in texts]}
-        prompt = dedent(
+        if orjson is not None:
+            payload_json = orjson.dumps(payload).decode("utf-8")
+        else:
+            payload_json = json.dumps(payload, ensure_ascii=False)
+        return dedent(
             f"""
             Classify the following reviews.
-            Return ONLY the JSON array of objects with keys {primary, secondary} as per schema.
+            Return ONLY the JSON array of objects with keys {{primary, secondary}} as per schema.
             Input:
-            {json.dumps(payload, ensure_ascii=False)}
+            {payload_json}
             """
         ).strip()
 
+    def _call_model_once(self, texts: Sequence[str]) -> List[dict]:
+        labels, keys, misses = self._lookup_cache(texts)
+        if not misses:
+            return labels
+        raw = self._request_labels([texts[i] for i in misses])
+        return self._fill_from_response(labels, keys, misses, raw)
+
+    async def _call_model_once_async(self, texts: Sequence[str]) -> List[dict]:
+        labels, keys, misses = self._lookup_cache(texts)
+        if not misses:
+            return labels
+        raw = await self._request_labels_async([texts[i] for i in misses])
+        return self._fill_from_response(labels, keys, misses, raw)
+
+    def _request_labels(self, texts: Sequence[str]) -> List[dict]:
+        """Ask Gemini to label *texts*, halving and re-asking if the reply comes back truncated."""
+
+        if self.request_bucket is not None:
+            self.request_bucket.acquire_blocking()
+        if self.token_bucket is not None:
+            self.token_bucket.acquire_blocking(self._estimate_tokens(texts))
         response = self.client.models.generate_content(
             model=self.config.model,
-            contents=prompt,
+            contents=self._build_prompt(texts),
             config=self.generate_config,
         )
+        raw = self._parse_response(response)
+        if 0 < len(raw) < len(texts) and len(texts) > 1:
+            self._log_truncation(len(raw), len(texts))
+            mid = len(texts) // 2
+            return self._request_labels(texts[:mid]) + self._request_labels(texts[mid:])
+        return raw
+
+    async def _request_labels_async(self, texts: Sequence[str]) -> List[dict]:
+        if self.request_bucket is not None:
+            await self.request_bucket.acquire()
+        if self.token_bucket is not None:
+            await self.token_bucket.acquire(self._estimate_tokens(texts))
+        response = await self.client.aio.models.generate_content(
+            model=self.config.model,
+            contents=self._build_prompt(texts),
+            config=self.generate_config,
+        )
+        raw = self._parse_response(response)
+        if 0 < len(raw) < len(texts) and len(texts) > 1:
+            self._log_truncation(len(raw), len(texts))
+            mid = len(texts) // 2
+            # Sequential, so the halves stay within the caller's concurrency slot.
+            left = await self._request_labels_async(texts[:mid])
+            return left + await self._request_labels_async(texts[mid:])
+        return raw
+
+    def _log_truncation(self, received: int, requested: int) -> None:
+        self.logger.info(
+            "Gemini returned %s of %s labels (truncated reply); retrying as two halves.", received, requested
+        )
+
+    def _lookup_cache(self, texts: Sequence[str]) -> Tuple[List[Optional[dict]], List[str], List[int]]:
+        """Return cached labels in input order (``None`` for misses), their keys and the miss positions."""
 
+        if self.cache is None:
+            return [None] * len(texts), [], list(range(len(texts)))
+        prefix = self._cache_prefix
+        keys = [hashlib.blake2b((prefix + t).encode("utf-8"), digest_size=16).hexdigest() for t in texts]
+        found = self.cache.get_many(keys)
+        labels = [found.get(key) for key in keys]
+        misses = [i for i, label in enumerate(labels) if label is None]
+        return labels, keys, misses
+
+    def _fill_from_response(
+        self,
+        labels: List[Optional[dict]],
+        keys: List[str],
+        misses: List[int],
+        raw: List[dict],
+    ) -> List[dict]:
+        """Slot *raw* model output into the miss positions; cache it only when the counts line up."""
+
+        if not raw:
+            return []
+        if len(raw) != len(misses):
+            self.logger.warning(
+                "Gemini returned %s labels for %s reviews; padding with defaults.", len(raw), len(misses)
+            )
+        elif self.cache is not None:
+            self.cache.put_many(list(zip((keys[i] for i in misses), self._post_sanitise(raw))))
+        for i, label in zip(misses, raw):
+            labels[i] = label
+        return [label if label is not None else {} for label in labels]
+
+    def _parse_response(self, response: Any) -> List[dict]:
         parsed = self._coerce_label_items(getattr(response, "parsed", None))
         if parsed:
             return parsed
@@ -264,26 +536,18 @@ class GeminiLabeler(BaseLabeler):
     def _post_sanitise(self, raw_items: List[dict]) -> List[dict]:
         cleaned: List[dict] = []
         for item in raw_items:
-            primary = self._normalize_enum(item.get("primary"), PRIMARY_ALLOW, PRIMARY_MAP, "INVALID")
-            secondary = self._normalize_enum(item.get("secondary"), SECONDARY_ALLOW, SECONDARY_MAP, "GENERAL")
+            primary = self._normalize_enum(item.get("primary"), "primary")
+            secondary = self._normalize_enum(item.get("secondary"), "secondary")
             cleaned.append({"primary": primary, "secondary": secondary})
         return cleaned
 
-    def _normalize_enum(
-        self,
-        value: Any,
-        allow: set,
-        mapping: Dict[str, str],
-        fallback: str,
-    ) -> str:
+    @staticmethod
+    def _normalize_enum(value: Any, kind: str) -> str:
         if isinstance(value, Enum):
             value = value.value
         if isinstance(value, str):
-            trimmed = value.strip().upper().replace(" ", "_")
-            trimmed = mapping.get(trimmed, trimmed)
-            if trimmed in allow:
-                return trimmed
-        return fallback
+            return _normalize_label(value, kind)
+        return LABEL_RULES[kind][1]
 
     def _coerce_label_items(self, data: Any) -> List[dict] | None:
         if data is None:
@@ -295,17 +559,47 @@ class GeminiLabeler(BaseLabeler):
                 if converted:
                     results.append(converted)
             return results
+        if isinstance(data, dict):
+            # Replies occasionally wrap the array in an object, e.g. {"labels": [...]}.
+            lists = [value for value in data.values() if isinstance(value, list)]
+            return self._coerce_label_items(lists[0]) if len(lists) == 1 else None
         if isinstance(data, str):
-            return self._coerce_label_items(self._clean_response_text(data))
+            cleaned = self._clean_response_text(data)
+            if _LABEL_LIST_DECODER is not None:
+                # Well-formed replies decode straight into structs in C; anything else
+                # (aliased keys, a wrapping object) takes the generic path below.
+                try:
+                    items = _LABEL_LIST_DECODER.decode(cleaned)
+                except msgspec.MsgspecError:
+                    pass
+                else:
+                    return [{"primary": item.primary, "secondary": item.secondary} for item in items]
+            try:
+                decoded = json.loads(cleaned)
+            except ValueError:
+                return None
+            return self._coerce_label_items(decoded) if not isinstance(decoded, str) else None
         return None
 
     def _convert_to_label_dict(self, item: Any) -> Dict[str, str] | None:
+        # Fast paths: schema-constrained replies are already valid, so skip the generic coercion.
+        if isinstance(item, LabelPair):
+            return {"primary": item.primary.value, "secondary": item.secondary.value}
+        if isinstance(item, dict):
+            primary = item.get("primary")
+            secondary = item.get("secondary")
+            if (
+                type(primary) is str
+                and type(secondary) is str
+                and primary in PRIMARY_ALLOW
+                and secondary in SECONDARY_ALLOW
+            ):
+                return {"primary": primary, "secondary": secondary}
+
         if item is None:
             return None
-        if isinstance(item, LabelPair):
+        if isinstance(item, BaseModel):
             payload: Dict[str, Any] = item.model_dump()
-        elif isinstance(item, BaseModel):
-            payload = item.model_dump()
         elif isinstance(item, dict):
             payload = item
         else:
@@ -339,13 +633,9 @@ class GeminiLabeler(BaseLabeler):
 
     def _clean_response_text(self, text: str) -> str:
         stripped = text.strip()
-        if stripped.startswith("```"):
-            lines = stripped.splitlines()
-            if lines:
-                lines = lines[1:]
-                while lines and lines[-1].strip().startswith("```"):
-                    lines = lines[:-1]
-            stripped = "\n".join(lines).strip()
+        match = CODE_FENCE_RE.match(stripped)
+        if match:
+            stripped = (match.group(1) or "").strip()
 
         if stripped.endswith(";"):
             stripped = stripped[:-1].rstrip()
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from typing import Optional
+
+
+class TokenBucket:
+    """Token bucket refilled at *rate_per_minute*, holding at most *capacity* tokens.
+
+    Callers reserve tokens up front: a reservation larger than the current balance
+    puts the bucket into debt and returns how long the caller must wait, so
+    concurrent callers queue behind each other without a shared event loop object.
+    """
+
+    def __init__(self, rate_per_minute: float, capacity: Optional[float] = None) -> None:
+        if rate_per_minute <= 0:
+            raise ValueError("rate_per_minute must be positive")
+        self.rate = rate_per_minute / 60.0
+        self.capacity = float(capacity if capacity is not None else rate_per_minute)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, tokens: float = 1.0) -> float:
+        """Take *tokens* from the bucket and return the seconds to wait before using them."""
+
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= tokens
+            return max(0.0, -self._tokens / self.rate)
+
+    async def acquire(self, tokens: float = 1.0) -> None:
+        delay = self.reserve(tokens)
+        if delay:
+            await asyncio.sleep(delay)
+
+    def acquire_blocking(self, tokens: float = 1.0) -> None:
+        delay = self.reserve(tokens)
+        if delay:
+            time.sleep(delay)
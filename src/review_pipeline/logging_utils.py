@@ -1,9 +1,12 @@
 from __future__ import annotations
 
+import atexit
 import logging
 import logging.config
+import logging.handlers
+import queue
 from pathlib import Path
-from typing import Dict
+from typing import Dict, Optional
 
 from .config import LoggingConfig
 
@@ -32,44 +35,57 @@ DEFAULT_LOGGING: Dict[str, object] = {
 }
 
 
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
 def setup_logging(config: LoggingConfig) -> None:
-    """Configure the logging subsystem based on the provided *config*."""
+    """Configure the logging subsystem based on the provided *config*.
+
+    The root logger only enqueues records; a :class:`QueueListener` thread does the
+    console and file writes, so logging calls never block on disk I/O.
+    """
+
+    global _listener
 
-    log_config = DEFAULT_LOGGING.copy()
-    fmt = config.fmt
     level = config.level.upper()
     logfile = Path(config.file)
     logfile.parent.mkdir(parents=True, exist_ok=True)
 
-    log_config["formatters"] = {
-        "standard": {
-            "format": fmt,
-        }
-    }
-
-    handlers = {
-        "console": {
-            "class": "logging.StreamHandler",
-            "formatter": "standard",
-            "level": level,
-        },
-        "file": {
-            "class": "logging.handlers.RotatingFileHandler",
-            "formatter": "standard",
-            "level": level,
-            "filename": str(logfile),
-            "maxBytes": 5 * 1024 * 1024,
-            "backupCount": 3,
-            "encoding": "utf-8",
-        },
-    }
-
-    log_config["handlers"] = handlers
-    log_config["loggers"] = {
-        "": {
-            "handlers": ["console", "file"],
-            "level": level,
-        }
-    }
+    formatter = logging.Formatter(config.fmt)
+    console_handler = logging.StreamHandler()
+    file_handler = logging.handlers.RotatingFileHandler(
+        logfile,
+        maxBytes=5 * 1024 * 1024,
+        backupCount=3,
+        encoding="utf-8",
+        delay=True,
+    )
+    for handler in (console_handler, file_handler):
+        handler.setFormatter(formatter)
+        handler.setLevel(level)
 
+    log_config = DEFAULT_LOGGING.copy()
+    log_config["handlers"] = {}
+    log_config["loggers"] = {"": {"handlers": [], "level": level}}
     logging.config.dictConfig(log_config)
+
+    _stop_listener()
+    log_queue: queue.Queue = queue.Queue(-1)
+    logging.getLogger().addHandler(logging.handlers.QueueHandler(log_queue))
+    _listener = logging.handlers.QueueListener(log_queue, console_handler, file_handler, respect_handler_level=True)
+    _listener.start()
+
+
+def _stop_listener() -> None:
+    """Flush queued records and close the handlers at interpreter exit."""
+
+    global _listener
+
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+atexit.register(_stop_listener)
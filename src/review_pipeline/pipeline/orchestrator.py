@@ -2,12 +2,14 @@
 from __future__ import annotations
 
 import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Tuple
 
 from ..config import ProjectConfig
 from ..crawlers.app_store import AppStoreCrawler
+from ..crawlers.base import BaseCrawler
 from ..crawlers.google_play import GooglePlayCrawler
 from ..processors.cleaning import LabelingDatasetPreparer
 from ..processors.labeling import LabelingWorkflow
@@ -24,34 +26,50 @@ class ReviewPipeline:
     def run_crawl(self, timestamp: Optional[str] = None) -> Dict[str, Optional[Path]]:
         outputs: Dict[str, Optional[Path]] = {"google_play": None, "app_store": None}
 
+        # (output key, display name, filename pattern, crawler)
+        jobs: List[Tuple[str, str, str, BaseCrawler]] = []
         google_cfg = self.config.scraping.google_play
         if google_cfg:
-            crawler = GooglePlayCrawler(google_cfg)
-            df = crawler.fetch()
-            if not df.empty:
-                filename = timestamped_filename("google_play_reviews_{timestamp}.csv", timestamp)
-                path = ensure_parent_dir(self.config.paths.raw_dir / filename)
-                df.to_csv(path, index=False, encoding="utf-8-sig")
-                outputs["google_play"] = path
-                self.logger.info("Google Play reviews saved to %s", path)
-            else:
-                self.logger.warning("Google Play crawler returned no data.")
-
+            jobs.append(
+                ("google_play", "Google Play", "google_play_reviews_{timestamp}.csv", GooglePlayCrawler(google_cfg))
+            )
         app_store_cfg = self.config.scraping.app_store
         if app_store_cfg:
-            crawler = AppStoreCrawler(app_store_cfg)
-            df = crawler.fetch()
-            if not df.empty:
-                filename = timestamped_filename("app_store_reviews_{timestamp}.csv", timestamp)
-                path = ensure_parent_dir(self.config.paths.raw_dir / filename)
-                df.to_csv(path, index=False, encoding="utf-8-sig")
-                outputs["app_store"] = path
-                self.logger.info("App Store reviews saved to %s", path)
-            else:
-                self.logger.warning("App Store crawler returned no data.")
+            jobs.append(
+                ("app_store", "App Store", "app_store_reviews_{timestamp}.csv", AppStoreCrawler(app_store_cfg))
+            )
+        if not jobs:
+            return outputs
+
+        # The crawlers share no state, so each job fetches and writes its CSV on its
+        # own worker thread; a slow store never holds up the other store's write.
+        with ThreadPoolExecutor(max_workers=len(jobs)) as executor:
+            futures = {
+                executor.submit(self._crawl_to_csv, crawler, label, pattern, timestamp): key
+                for key, label, pattern, crawler in jobs
+            }
+            for future in as_completed(futures):
+                outputs[futures[future]] = future.result()
 
         return outputs
 
+    def _crawl_to_csv(
+        self,
+        crawler: BaseCrawler,
+        label: str,
+        pattern: str,
+        timestamp: Optional[str],
+    ) -> Optional[Path]:
+        df = crawler.fetch()
+        if df.empty:
+            self.logger.warning("%s crawler returned no data.", label)
+            return None
+        filename = timestamped_filename(pattern, timestamp)
+        path = ensure_parent_dir(self.config.paths.raw_dir / filename)
+        df.to_csv(path, index=False, encoding="utf-8-sig")
+        self.logger.info("%s reviews saved to %s", label, path)
+        return path
+
     def run_merge(
         self,
         google_csv: Optional[Path],
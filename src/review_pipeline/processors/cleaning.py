@@ -3,44 +3,98 @@ from __future__ import annotations
 
 import json
 import logging
+import os
 import re
 import unicodedata
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
+from itertools import repeat
 from pathlib import Path
+from typing import Iterator, List, Optional
 
+import numpy as np
 import pandas as pd
 
-from ..config import CleaningConfig
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speed-up
+    orjson = None
 
+try:
+    import re2
+except ImportError:  # pragma: no cover - optional linear-time regex engine
+    re2 = None
 
-FULLWIDTH_CHARS = (
-    "０１２３４５６７８９ＡＢＣＤＥＦＧＨＩＪＫＬＭＮＯＰＱＲＳＴＵＶＷＸＹＺ"
-    "ａｂｃｄｅｆｇｈｉｊｋｌｍｎｏｐｑｒｓｔｕｖｗｘｙｚ"
-    "！＂＃＄％＆＇（）＊＋，－．／：；＜＝＞？＠［＼］＾＿｀｛｜｝～　"
+from ..config import CleaningConfig
+from ..utils.files import IO_BUFFER_SIZE
+
+
+# Patterns are plain character classes so they mean the same under Python ``re`` and RE2
+# (google-re2 for single strings, pyarrow's RE2 kernels for Arrow-backed Series).
+EMOJI_CHARS = (
+    "😀-🙏"
+    "🌀-🗿"
+    "🚀-🛿"
+    "🇠-🇿"
+    "🤀-🧿"
+    "🨀-🩯"
+    "🩰-🫿"
+    "☀-⛿"
+    "✀-➿"
+    "🀄🃏"
+    "🅰-🉑"
+    "︀-️"
+    " -⁯"
 )
-HALFWIDTH_CHARS = (
-    "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ"
-    "abcdefghijklmnopqrstuvwxyz"
-    "!"#$%&'()*+,-./:;<=>?@[\]^_`{|}~ "
+# Every character ``str.isspace`` accepts, spelled out because RE2's ``\s`` is ASCII-only.
+WHITESPACE_CHARS = "\t-\r\x1c- \x85\xa0\u1680\u2000-\u200a\u2028\u2029\u202f\u205f\u3000"
+EMOJI_PATTERN = f"[{EMOJI_CHARS}]"
+WHITESPACE_PATTERN = f"[{WHITESPACE_CHARS}]+"
+# One pass for emoji removal + whitespace collapse: a run of emoji/whitespace that contains
+# whitespace (group 1) becomes a single space, an emoji-only run disappears. Whitespace inside
+# the emoji ranges (U+2000-U+206F) is removed as emoji, so it is left out of the space class.
+_SPACE_CHARS = "\t-\r\x1c- \x85\xa0\u1680\u3000"
+EMOJI_OR_WHITESPACE_PATTERN = (
+    f"([{EMOJI_CHARS}]*[{_SPACE_CHARS}][{_SPACE_CHARS}{EMOJI_CHARS}]*)|[{EMOJI_CHARS}]+"
 )
-TRANSLATION_TABLE = str.maketrans(FULLWIDTH_CHARS, HALFWIDTH_CHARS)
-
-EMOJI_REGEX = re.compile(
-    "[😀-🙏]"
-    "|[🌀-🗿]"
-    "|[🚀-🛿]"
-    "|[🇠-🇿]"
-    "|[🤀-🧿]"
-    "|[🨀-🩯]"
-    "|[🩰-🫿]"
-    "|[☀-⛿]"
-    "|[✀-➿]"
-    "|[🀄🃏]"
-    "|[🅰-🉑]"
-    "|[︀-️]"
-    "|[ -⁯]",
-    flags=re.UNICODE,
+_regex_engine = re2 if re2 is not None else re
+EMOJI_REGEX = _regex_engine.compile(EMOJI_PATTERN)
+WHITESPACE_REGEX = _regex_engine.compile(WHITESPACE_PATTERN)
+EMOJI_OR_WHITESPACE_REGEX = _regex_engine.compile(EMOJI_OR_WHITESPACE_PATTERN)
+# CJK Unified Ideographs (basic block, Extension A and Extensions B-E), as one character class.
+CJK_PATTERN = (
+    "[\u4e00-\u9fff\u3400-\u4dbf\U00020000-\U0002a6df"
+    "\U0002a700-\U0002b73f\U0002b740-\U0002b81f\U0002b820-\U0002ceaf]"
 )
+CJK_REGEX = re.compile(CJK_PATTERN)
+
+# Below this many rows, process start-up costs more than cleaning in a single process.
+PARALLEL_MIN_ROWS = 50_000
+
+# Merged CSVs larger than this (bytes) are read and cleaned READ_CHUNK_ROWS rows at a time.
+STREAM_READ_THRESHOLD = 256 * 1024 * 1024
+READ_CHUNK_ROWS = 100_000
+
+# The prepared file is a JSON array of fixed-shape records; writing each record from these
+# fragments reproduces ``dumps(records, indent=2)`` byte for byte without holding the list.
+_RECORD_HEAD = b'\n  {\n    "text": '
+_RECORD_TAIL = b',\n    "primary": "",\n    "secondary": ""\n  }'
+
+
+def _emoji_or_whitespace(match: re.Match) -> str:
+    return " " if match.group(1) is not None else ""
+
+
+def _encode_text(text: str) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(text)
+    return json.dumps(text, ensure_ascii=False).encode("utf-8")
+
+
+def _clean_chunk(texts: List[str], config: CleaningConfig) -> List[str]:
+    """Worker entry point: clean and filter one shard of review texts."""
+
+    return LabelingDatasetPreparer(config).clean_and_filter(pd.Series(texts, dtype="string"))
 
 
 @dataclass
@@ -49,50 +103,98 @@ class LabelingDatasetPreparer:
     logger: logging.Logger = logging.getLogger("review_pipeline.processors.cleaning")
 
     def prepare(self, merged_csv: Path, output_json: Path) -> Path:
-        df = pd.read_csv(merged_csv)
-        self.logger.info("Loaded %s merged reviews from %s", len(df), merged_csv)
-
-        prepared = []
-        for _, row in df.iterrows():
-            text = str(row.get("content", "")).strip()
-            if not text:
-                continue
-            cleaned = self.clean_text(text)
-            if not self._passes_length_checks(cleaned):
-                continue
-            prepared.append({"text": cleaned, "primary": "", "secondary": ""})
+        n_jobs = self.config.n_jobs or os.cpu_count() or 1
+        loaded = prepared = 0
+        pool: Optional[ProcessPoolExecutor] = None
 
         output_json.parent.mkdir(parents=True, exist_ok=True)
-        with output_json.open("w", encoding="utf-8") as handle:
-            json.dump(prepared, handle, ensure_ascii=False, indent=2)
-
-        self.logger.info("Prepared %s items for labeling -> %s", len(prepared), output_json)
+        try:
+            with output_json.open("wb", buffering=IO_BUFFER_SIZE) as handle:
+                handle.write(b"[")
+                for content in self._iter_content(merged_csv):
+                    loaded += len(content)
+                    texts = content.astype("string").fillna("").str.strip()
+                    texts = texts[texts != ""]
+
+                    if n_jobs > 1 and len(texts) >= PARALLEL_MIN_ROWS:
+                        if pool is None:
+                            pool = ProcessPoolExecutor(max_workers=n_jobs)
+                        self.logger.info("Cleaning %s reviews across %s processes", len(texts), n_jobs)
+                        shards = [shard.tolist() for shard in np.array_split(texts.to_numpy(dtype=object), n_jobs)]
+                        kept = [text for part in pool.map(_clean_chunk, shards, repeat(self.config)) for text in part]
+                    else:
+                        kept = self.clean_and_filter(texts)
+
+                    for text in kept:
+                        if prepared:
+                            handle.write(b",")
+                        handle.write(_RECORD_HEAD + _encode_text(text) + _RECORD_TAIL)
+                        prepared += 1
+                handle.write(b"\n]" if prepared else b"]")
+        finally:
+            if pool is not None:
+                pool.shutdown()
+
+        self.logger.info("Loaded %s merged reviews from %s", loaded, merged_csv)
+        self.logger.info("Prepared %s items for labeling -> %s", prepared, output_json)
         return output_json
 
+    @staticmethod
+    def _iter_content(merged_csv: Path) -> Iterator[pd.Series]:
+        """Yield the ``content`` column, in row chunks once the file is past STREAM_READ_THRESHOLD.
+
+        Smaller files are parsed in one go by Arrow (when pyarrow is installed); its CSV
+        engine cannot chunk, so large files go through the C parser to bound peak memory.
+        """
+
+        if merged_csv.stat().st_size > STREAM_READ_THRESHOLD:
+            for chunk in pd.read_csv(merged_csv, usecols=["content"], dtype="string", chunksize=READ_CHUNK_ROWS):
+                yield chunk["content"]
+            return
+        try:
+            df = pd.read_csv(merged_csv, engine="pyarrow", dtype_backend="pyarrow", usecols=["content"])
+        except ImportError:  # pragma: no cover - pyarrow not installed
+            df = pd.read_csv(merged_csv, usecols=["content"])
+        yield df["content"]
+
     def clean_text(self, text: str) -> str:
-        text = text.translate(TRANSLATION_TABLE)
+        # NFKC also folds fullwidth ASCII and the ideographic space to their halfwidth forms.
         text = unicodedata.normalize("NFKC", text)
         if self.config.enable_emoji_removal:
-            text = EMOJI_REGEX.sub("", text)
-        text = re.sub(r"\s+", " ", text)
+            text = EMOJI_OR_WHITESPACE_REGEX.sub(_emoji_or_whitespace, text)
+        else:
+            text = WHITESPACE_REGEX.sub(" ", text)
         return text.strip()
 
+    def clean_series(self, texts: pd.Series) -> pd.Series:
+        """Vectorised :meth:`clean_text` over a string Series.
+
+        Emoji and whitespace stay two substitutions here: each is a single RE2 kernel call
+        on Arrow-backed data, which a per-match callback would forfeit.
+        """
+
+        texts = texts.str.normalize("NFKC")
+        if self.config.enable_emoji_removal:
+            texts = texts.str.replace(EMOJI_PATTERN, "", regex=True)
+        return texts.str.replace(WHITESPACE_PATTERN, " ", regex=True).str.strip()
+
+    def clean_and_filter(self, texts: pd.Series) -> List[str]:
+        """Clean *texts* and return those passing the length checks, in order."""
+
+        cleaned = self.clean_series(texts)
+        return cleaned[self._length_mask(cleaned)].tolist()
+
+    def _length_mask(self, texts: pd.Series) -> pd.Series:
+        """Vectorised :meth:`_passes_length_checks`: a boolean mask of rows to keep."""
+
+        return (texts.str.len() >= self.config.min_length) & (
+            texts.str.count(CJK_PATTERN) >= self.config.min_chinese_chars
+        )
+
     def _passes_length_checks(self, text: str) -> bool:
         if len(text) < self.config.min_length:
             return False
-        chinese_chars = sum(1 for ch in text if self._is_cjk(ch))
+        chinese_chars = len(CJK_REGEX.findall(text))
         if chinese_chars < self.config.min_chinese_chars:
             return False
         return True
-
-    @staticmethod
-    def _is_cjk(char: str) -> bool:
-        codepoint = ord(char)
-        return (
-            0x4E00 <= codepoint <= 0x9FFF
-            or 0x3400 <= codepoint <= 0x4DBF
-            or 0x20000 <= codepoint <= 0x2A6DF
-            or 0x2A700 <= codepoint <= 0x2B73F
-            or 0x2B740 <= codepoint <= 0x2B81F
-            or 0x2B820 <= codepoint <= 0x2CEAF
-        )
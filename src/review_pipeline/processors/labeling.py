@@ -1,15 +1,17 @@
 
 from __future__ import annotations
 
-import json
+import asyncio
 import logging
+import shutil
 from dataclasses import dataclass
 from pathlib import Path
-from typing import List, Optional, Sequence
+from typing import List, Optional, Sequence, Tuple
 
 from ..config import LabelingConfig
 from ..labelers.base import BaseLabeler
 from ..labelers.gemini import GeminiLabeler
+from ..utils.files import read_records, write_json
 
 
 @dataclass
@@ -29,6 +31,29 @@ class LabelingWorkflow:
         labeled_output: Path,
         fixed_output: Optional[Path] = None,
         run_validation: bool = True,
+    ) -> dict:
+        # Labeling and every validation round share one event loop, so the labeler's
+        # async connection pool stays usable (and warm) from the first request to the last.
+        return asyncio.run(self._run_async(unlabeled_path, labeled_output, fixed_output, run_validation))
+
+    async def _run_async(
+        self,
+        unlabeled_path: Path,
+        labeled_output: Path,
+        fixed_output: Optional[Path],
+        run_validation: bool,
+    ) -> dict:
+        try:
+            return await self._label_and_validate(unlabeled_path, labeled_output, fixed_output, run_validation)
+        finally:
+            await self.labeler.aclose()
+
+    async def _label_and_validate(
+        self,
+        unlabeled_path: Path,
+        labeled_output: Path,
+        fixed_output: Optional[Path],
+        run_validation: bool,
     ) -> dict:
         data = self._load_json(unlabeled_path)
         self.logger.info("Loaded %s records for labeling from %s", len(data), unlabeled_path)
@@ -38,7 +63,7 @@ class LabelingWorkflow:
 
         if pending:
             self.logger.info("Annotating %s previously unlabeled records", len(pending))
-            annotated = self.labeler.annotate(pending)
+            annotated = await self.labeler.annotate_async(pending)
             combined = completed + annotated
         else:
             self.logger.info("No unlabeled records found; skipping annotation step")
@@ -50,14 +75,19 @@ class LabelingWorkflow:
         self.logger.info("Labeled dataset saved to %s", labeled_output)
 
         fixed_records: Optional[List[dict]] = None
+        changed = False
         if run_validation and combined:
-            fixed_records = self._run_validation_loop([dict(item) for item in combined])
+            fixed_records, changed = await self._run_validation_loop(combined)
 
         results = {"labeled_path": labeled_output, "fixed_path": None}
         if fixed_records and fixed_output:
             fixed_output = fixed_output.resolve()
             fixed_output.parent.mkdir(parents=True, exist_ok=True)
-            self._write_json(fixed_records, fixed_output)
+            if changed:
+                self._write_json(fixed_records, fixed_output)
+            else:
+                # Nothing was relabelled: the labeled file already holds these exact bytes.
+                shutil.copyfile(labeled_output, fixed_output)
             self.logger.info("Validation-corrected dataset saved to %s", fixed_output)
             results["fixed_path"] = fixed_output
         elif fixed_records and not fixed_output:
@@ -65,15 +95,22 @@ class LabelingWorkflow:
 
         return results
 
-    def _run_validation_loop(self, records: List[dict]) -> List[dict]:
+    async def _run_validation_loop(self, records: List[dict]) -> Tuple[List[dict], bool]:
+        """Relabel invalid records until all pass or the round limit is hit.
+
+        Neither *records* nor its dicts are modified: only records that get relabelled
+        are copied, into a new list that is returned together with whether any record
+        was relabelled.
+        """
+
         max_rounds = getattr(self.config.gemini, "validate_max_rounds", 1)
-        batch_size = getattr(self.config.gemini, "batch_size", 100)
+        records = list(records)
 
         for round_id in range(1, max_rounds + 1):
             diagnostics = self.labeler.validate(records)
             if not diagnostics:
                 self.logger.info("Validation round %s: all labels valid", round_id)
-                return records
+                return records, round_id > 1
 
             self.logger.warning(
                 "Validation round %s: %s invalid records detected", round_id, len(diagnostics)
@@ -89,35 +126,32 @@ class LabelingWorkflow:
                 )
 
             indices = [d["index"] for d in diagnostics]
-            for start in range(0, len(indices), batch_size):
-                chunk = indices[start : start + batch_size]
-                batch = [records[idx] for idx in chunk]
-                for item in batch:
-                    if not item.get("text"):
-                        fallback = item.get("content") or item.get("review") or ""
-                        item["text"] = fallback
-                        if not fallback:
-                            item["primary"] = "INVALID"
-                            item["secondary"] = "GENERAL"
-                relabeled = self.labeler.annotate_batch(batch)
-                for offset, idx in enumerate(chunk):
-                    if offset < len(relabeled):
-                        records[idx]["primary"] = relabeled[offset].get("primary", "INVALID")
-                        records[idx]["secondary"] = relabeled[offset].get("secondary", "GENERAL")
+            batch = [dict(records[idx]) for idx in indices]
+            for item in batch:
+                if not item.get("text"):
+                    fallback = item.get("content") or item.get("review") or ""
+                    item["text"] = fallback
+                    if not fallback:
+                        item["primary"] = "INVALID"
+                        item["secondary"] = "GENERAL"
+            # annotate_async() batches the invalid records itself and keeps several batches in flight.
+            relabeled = await self.labeler.annotate_async(batch)
+            for idx, item, labelled in zip(indices, batch, relabeled):
+                item["primary"] = labelled.get("primary", "INVALID")
+                item["secondary"] = labelled.get("secondary", "GENERAL")
+                records[idx] = item
             self.logger.info("Validation round %s completed", round_id)
 
         self.logger.warning(
             "Reached maximum validation rounds (%s); dataset may still contain invalid labels.",
             max_rounds,
         )
-        return records
+        return records, True
 
     @staticmethod
     def _load_json(path: Path) -> List[dict]:
-        with path.open("r", encoding="utf-8") as handle:
-            return json.load(handle)
+        return read_records(path)
 
     @staticmethod
     def _write_json(data: Sequence[dict], path: Path) -> None:
-        with path.open("w", encoding="utf-8") as handle:
-            json.dump(list(data), handle, ensure_ascii=False, indent=2)
+        write_json(list(data), path)
@@ -1,15 +1,31 @@
 
 from __future__ import annotations
 
+import codecs
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Optional
 
+import numpy as np
 import pandas as pd
 
+try:
+    import pyarrow as pa
+    from pyarrow import csv as pacsv
+except ImportError:  # pragma: no cover - optional speed-up
+    pa = pacsv = None
+
 from ..config import MergingConfig
 
+# Arrow's CSV reader and writer only speak UTF-8; other encodings go through pandas.
+ARROW_ENCODINGS = {"utf-8", "utf8", "utf-8-sig", "utf_8_sig"}
+PLATFORMS = ("google_play", "app_store")
+ARROW_STRING = "string[pyarrow]"
+# Read as text regardless of content so Arrow never infers timestamps or numeric ids.
+TEXT_COLUMNS = {name: ARROW_STRING for name in ("reviewId", "userName", "date", "review")}
+
 
 @dataclass
 class ReviewMerger:
@@ -34,8 +50,8 @@ class ReviewMerger:
             return pd.DataFrame(columns=self.unified_columns)
 
         merged = pd.concat(frames, ignore_index=True)
-        merged.drop_duplicates(subset=["reviewId"], keep="first", inplace=True)
-        merged = merged[self.unified_columns]
+        # Hash only the id column and take rows and columns in one selection.
+        merged = merged.loc[~merged["reviewId"].duplicated(keep="first"), self.unified_columns]
         self.logger.info("Merged %s reviews", len(merged))
         return merged
 
@@ -45,31 +61,61 @@ class ReviewMerger:
         app_store_csv: Optional[Path],
         output_path: Path,
     ) -> Path:
-        google_df = self._load_csv(google_csv) if google_csv else None
-        app_store_df = self._load_csv(app_store_csv) if app_store_csv else None
+        # CSV parsing releases the GIL, so both stores' files load side by side.
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            google_future = executor.submit(self._load_csv, google_csv) if google_csv else None
+            app_store_future = executor.submit(self._load_csv, app_store_csv) if app_store_csv else None
+            google_df = google_future.result() if google_future else None
+            app_store_df = app_store_future.result() if app_store_future else None
         merged = self.merge_frames(google_df, app_store_df)
         output_path.parent.mkdir(parents=True, exist_ok=True)
-        merged.to_csv(output_path, index=False, encoding=self.config.encoding)
+        self._write_csv(merged, output_path)
         self.logger.info("Merged reviews saved to %s", output_path)
         return output_path
 
     def _load_csv(self, path: Path) -> pd.DataFrame:
-        df = pd.read_csv(path, encoding=self.config.encoding)
+        if self._use_arrow():
+            # Arrow skips a UTF-8 byte-order mark on its own, so utf-8-sig needs no special case.
+            df = pd.read_csv(path, engine="pyarrow", dtype_backend="pyarrow", dtype=TEXT_COLUMNS)
+        else:
+            df = pd.read_csv(path, encoding=self.config.encoding)
         self.logger.info("Loaded %s rows from %s", len(df), path)
         return df
 
+    def _write_csv(self, df: pd.DataFrame, path: Path) -> None:
+        if not self._use_arrow():
+            df.to_csv(path, index=False, encoding=self.config.encoding)
+            return
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        with path.open("wb") as handle:
+            if codecs.lookup(self.config.encoding).name == "utf-8-sig":
+                handle.write(codecs.BOM_UTF8)
+            pacsv.write_csv(table, handle)
+
+    def _use_arrow(self) -> bool:
+        return pacsv is not None and self.config.encoding.lower() in ARROW_ENCODINGS
+
     def _normalise_google_play(self, df: pd.DataFrame) -> pd.DataFrame:
-        renamed = df.rename(
-            columns={"review": "content", "date": "date", "rating": "rating"}
-        ).copy()
-        renamed["platform"] = "google_play"
-        renamed["content"] = renamed["content"].fillna("")
-        renamed["date"] = renamed["date"].fillna("")
-        return renamed[self.unified_columns]
+        return self._normalise(df, "google_play")
 
     def _normalise_app_store(self, df: pd.DataFrame) -> pd.DataFrame:
-        renamed = df.rename(columns={"review": "content"}).copy()
-        renamed["platform"] = "app_store"
-        renamed["content"] = renamed["content"].fillna("")
-        renamed["date"] = renamed["date"].fillna("")
-        return renamed[self.unified_columns]
+        return self._normalise(df, "app_store")
+
+    def _normalise(self, df: pd.DataFrame, platform: str) -> pd.DataFrame:
+        # Build the unified frame from just the columns it needs rather than copying the
+        # whole crawler frame and trimming it afterwards.
+        return pd.DataFrame(
+            {
+                # Categorical: one int8 code per row instead of a string object.
+                "platform": pd.Categorical.from_codes(
+                    np.full(len(df), PLATFORMS.index(platform), dtype=np.int8), categories=PLATFORMS
+                ),
+                # Text columns as Arrow strings: one UTF-8 buffer per column, not a str per row.
+                "reviewId": df["reviewId"].astype(ARROW_STRING),
+                "userName": df["userName"].astype(ARROW_STRING),
+                "rating": df["rating"],
+                "date": df["date"].astype(ARROW_STRING).fillna(""),
+                "content": df["review"].astype(ARROW_STRING).fillna(""),
+            },
+            columns=self.unified_columns,
+        )
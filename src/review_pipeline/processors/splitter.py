@@ -1,16 +1,17 @@
 
 from __future__ import annotations
 
-import json
 import logging
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Dict
 
+import numpy as np
 import pandas as pd
 from sklearn.model_selection import train_test_split
 
 from ..config import SplittingConfig
+from ..utils.files import read_records, write_json
 
 
 @dataclass
@@ -19,42 +20,45 @@ class DatasetSplitter:
     logger: logging.Logger = logging.getLogger("review_pipeline.processors.splitter")
 
     def split(self, labeled_json: Path, train_output: Path, test_output: Path) -> Dict[str, Path]:
-        with labeled_json.open("r", encoding="utf-8") as handle:
-            data = json.load(handle)
-        df = pd.DataFrame(data)
-        self.logger.info("Loaded %s labeled rows from %s", len(df), labeled_json)
+        records = read_records(labeled_json)
+        self.logger.info("Loaded %s labeled rows from %s", len(records), labeled_json)
 
-        if df.empty:
+        if not records:
             raise ValueError("Labeled dataset is empty; cannot split.")
 
+        # Only the label column is needed to partition; records are selected by index and
+        # written back as-is instead of round-tripping through a DataFrame.
         stratify_field = self.config.stratify_field
-        if stratify_field not in df.columns:
+        if not any(stratify_field in record for record in records):
             raise ValueError(f"Stratify field '{stratify_field}' not present in dataset.")
-        if df[stratify_field].isnull().any():
+        # Integer class codes (sorted like np.unique would order the labels, so the split
+        # for a given random_state is unchanged) spare sklearn from re-hashing strings.
+        codes, _ = pd.factorize(np.array([record.get(stratify_field) for record in records], dtype=object), sort=True)
+        if (codes < 0).any():
             raise ValueError(f"Stratify field '{stratify_field}' contains null values.")
-        if (df[stratify_field].value_counts() < 2).any():
+        if (np.bincount(codes) < 2).any():
             self.logger.warning(
                 "Some classes have fewer than two samples; stratified split may fail."
             )
 
-        train_df, test_df = train_test_split(
-            df,
+        train_idx, test_idx = train_test_split(
+            np.arange(len(records)),
             test_size=self.config.test_size,
             random_state=self.config.random_state,
-            stratify=df[stratify_field],
+            stratify=codes,
         )
 
         train_output.parent.mkdir(parents=True, exist_ok=True)
         test_output.parent.mkdir(parents=True, exist_ok=True)
 
-        train_df.to_json(train_output, orient="records", force_ascii=False, indent=2)
-        test_df.to_json(test_output, orient="records", force_ascii=False, indent=2)
+        write_json([records[i] for i in train_idx], train_output)
+        write_json([records[i] for i in test_idx], test_output)
 
         self.logger.info(
             "Dataset split complete: %s train rows -> %s, %s test rows -> %s",
-            len(train_df),
+            len(train_idx),
             train_output,
-            len(test_df),
+            len(test_idx),
             test_output,
         )
 
@@ -1,14 +1,38 @@
 from __future__ import annotations
 
+import codecs
+import json
+import mmap
+import os
+import time
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import Any, BinaryIO, List, Optional, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speed-up
+    orjson = None
+
+# Buffer for streamed reads/writes (NDJSON lines, element-wise JSON output); the
+# io default of 8 KiB turns large files into hundreds of thousands of syscalls.
+IO_BUFFER_SIZE = 1 << 22
+
+
+@lru_cache(maxsize=1)
+def _timestamp_for(second: int) -> str:
+    return datetime.fromtimestamp(second).strftime("%Y%m%d_%H%M%S")
 
 
 def timestamped_filename(pattern: str, timestamp: Optional[str] = None) -> str:
-    """Return *pattern* formatted with a timestamp placeholder."""
+    """Return *pattern* formatted with a timestamp placeholder.
+
+    Without an explicit *timestamp* the current local time is used; it is formatted
+    once per wall-clock second, so calls within the same second share the string.
+    """
 
-    ts = timestamp or datetime.now().strftime("%Y%m%d_%H%M%S")
+    ts = timestamp or _timestamp_for(int(time.time()))
     return pattern.format(timestamp=ts)
 
 
@@ -18,3 +42,70 @@ def ensure_parent_dir(path: Path) -> Path:
     path = Path(path)
     path.parent.mkdir(parents=True, exist_ok=True)
     return path
+
+
+def read_json(path: Path) -> Any:
+    """Parse the UTF-8 JSON document at *path*."""
+
+    with Path(path).open("rb") as handle:
+        return _load_handle(handle)
+
+
+def read_records(path: Path) -> List[Any]:
+    """Load a list of records stored as a JSON array or as newline-delimited JSON."""
+
+    path = Path(path)
+    with path.open("rb", buffering=IO_BUFFER_SIZE) as handle:
+        head = handle.read(64).lstrip(b"\xef\xbb\xbf \t\r\n")
+        handle.seek(0)
+        if head.startswith(b"[") or not head:
+            return _load_handle(handle)
+        return [_loads(line) for line in handle if line.strip()]
+
+
+def write_json(data: Any, path: Path) -> None:
+    """Write *data* to *path* as UTF-8 JSON indented by two spaces.
+
+    Lists are written one element at a time, so the encoded document is never
+    held in memory in full; the bytes match a one-shot ``indent=2`` dump.
+    """
+
+    path = Path(path)
+    with path.open("wb", buffering=IO_BUFFER_SIZE) as handle:
+        if not isinstance(data, list) or not data:
+            handle.write(_dumps(data))
+            return
+        handle.write(b"[")
+        separator = b"\n  "
+        for item in data:
+            handle.write(separator + _dumps(item).replace(b"\n", b"\n  "))
+            separator = b",\n  "
+        handle.write(b"\n]")
+
+
+def _load_handle(handle: BinaryIO) -> Any:
+    """Parse a whole binary file; orjson reads it straight from a read-only memory map."""
+
+    if orjson is None or os.fstat(handle.fileno()).st_size == 0:
+        return _loads(handle.read())
+    with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        view = memoryview(mapped)
+        try:
+            return _loads(view)
+        finally:
+            view.release()
+
+
+def _loads(raw: Union[bytes, memoryview]) -> Any:
+    if orjson is not None:
+        # orjson rejects a byte-order mark; files saved as utf-8-sig start with one.
+        if raw[:3] == codecs.BOM_UTF8:
+            raw = raw[3:]
+        return orjson.loads(raw)
+    return json.loads(raw.decode("utf-8-sig"))
+
+
+def _dumps(data: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8")